@@ -0,0 +1,84 @@
+# benchmarks/auth.py
+"""Password hashing cost benchmark: login latency and logins per second per core.
+
+Run from the repository root:
+
+    python -m benchmarks.auth --output benchmarks/results/auth.json
+    python -m benchmarks.auth --profiles fast balanced scrypt --logins 50
+"""
+import argparse
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import RESULTS_DIR, latency_summary, time_calls, write_results
+from modules.passwords import get_hasher, needs_rehash, verify_password
+from modules.user_store import UserStore
+from utils.config import AuthConfig
+
+PASSWORD = "correct horse battery staple"
+
+
+def benchmark_profile(profile, logins=20, workers=None):
+    """Measure hashing and login cost for one AuthConfig profile"""
+    hasher = get_hasher(profile)
+    workers = workers or os.cpu_count() or 1
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = UserStore(os.path.join(tmp_dir, 'users.db'))
+        store.create_user('bench', hasher.hash(PASSWORD), 'bench@example.com', None)
+
+        def login():
+            # Same work as Authentication.login for an up-to-date hash
+            user = store.get_user('bench')
+            assert verify_password(PASSWORD, user['password'])
+            assert not needs_rehash(user['password'], hasher)
+
+        login()
+        hash_durations = time_calls(lambda: hasher.hash(PASSWORD), logins)
+        login_durations = time_calls(login, logins)
+
+        # hashlib releases the GIL while hashing, so threads use every core
+        with ThreadPoolExecutor(workers) as pool:
+            parallel = time_calls(lambda: list(pool.map(lambda _: login(), range(logins * workers))), 1)
+
+    per_core = 1 / float(login_durations.mean())
+    return {
+        'settings': AuthConfig.PROFILES[profile],
+        'hash_latency': latency_summary(hash_durations),
+        'login_latency': latency_summary(login_durations),
+        'logins_per_sec_per_core': round(per_core, 2),
+        'workers': workers,
+        'logins_per_sec_all_cores': round(logins * workers / float(parallel[0]), 2)
+    }
+
+
+def run(profiles=None, output=None, logins=20, workers=None):
+    """Benchmark the selected hashing profiles and write the results file"""
+    results = {
+        profile: benchmark_profile(profile, logins=logins, workers=workers)
+        for profile in profiles or AuthConfig.PROFILES
+    }
+    return write_results(results, output or os.path.join(RESULTS_DIR, 'auth.json'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--profiles', nargs='+', choices=list(AuthConfig.PROFILES),
+                        help='Hashing profiles to compare (default: all)')
+    parser.add_argument('--output', default=os.path.join(RESULTS_DIR, 'auth.json'), help='JSON results file')
+    parser.add_argument('--logins', type=int, default=20, help='Logins to time per profile (and per worker)')
+    parser.add_argument('--workers', type=int, help='Threads for the all-cores run (default: CPU count)')
+    args = parser.parse_args()
+
+    payload = run(args.profiles, args.output, logins=args.logins, workers=args.workers)
+    for profile, result in payload['results'].items():
+        latency = result['login_latency']
+        print(f"{profile:<9} p50={latency['p50_ms']:.1f}ms p99={latency['p99_ms']:.1f}ms "
+              f"{result['logins_per_sec_per_core']:,.1f} logins/s/core "
+              f"{result['logins_per_sec_all_cores']:,.1f} logins/s on {result['workers']} threads")
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
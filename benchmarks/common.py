@@ -0,0 +1,59 @@
+# benchmarks/common.py
+import json
+import os
+import platform
+import subprocess
+import time
+from datetime import datetime
+
+import numpy as np
+
+RESULTS_DIR = "benchmarks/results"
+
+
+def time_calls(func, repeats):
+    """Call func repeatedly and return each call's duration in seconds"""
+    durations = np.empty(repeats)
+    for i in range(repeats):
+        start = time.perf_counter()
+        func()
+        durations[i] = time.perf_counter() - start
+    return durations
+
+
+def latency_summary(durations):
+    """p50/p99/mean latency in milliseconds"""
+    durations_ms = np.asarray(durations) * 1000
+    return {
+        'p50_ms': round(float(np.percentile(durations_ms, 50)), 4),
+        'p99_ms': round(float(np.percentile(durations_ms, 99)), 4),
+        'mean_ms': round(float(durations_ms.mean()), 4),
+        'samples': len(durations_ms)
+    }
+
+
+def git_commit():
+    """Current commit hash, or None outside a git checkout"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_results(results, output_path):
+    """Write benchmark results as JSON, tagged with the commit and environment"""
+    payload = {
+        'timestamp': datetime.now().isoformat(),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': results
+    }
+
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    with open(output_path, 'w') as f:
+        json.dump(payload, f, indent=4)
+
+    return payload
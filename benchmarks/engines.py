@@ -0,0 +1,114 @@
+# benchmarks/engines.py
+"""Accuracy and latency benchmark for the recommendation engines.
+
+Run from the repository root:
+
+    python -m benchmarks.engines --output benchmarks/results/engines.json
+    python -m benchmarks.engines --profiles fast balanced accurate
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import joblib
+from sklearn.model_selection import train_test_split
+
+from benchmarks.common import RESULTS_DIR, latency_summary, time_calls, write_results
+from modules.data_loader import DataLoader
+from modules.professional_engine import ProfessionalEngine
+from modules.student_engine import StudentEngine
+from modules.tourist_engine import TouristEngine
+from utils.config import ModelConfig
+
+ENGINES = {
+    'student': StudentEngine,
+    'tourist': TouristEngine,
+    'professional': ProfessionalEngine
+}
+
+
+def holdout_inputs(engine):
+    """Raw user inputs for the rows train_model holds out"""
+    data = DataLoader().load_data(engine.dataset)
+    # Same split parameters as train_model, so these rows were never trained on
+    _, test_data = train_test_split(data, test_size=0.2, random_state=42)
+    feature_columns = engine.numeric_features + engine.categorical_features
+    return test_data[feature_columns].to_dict('records')
+
+
+def benchmark_engine(engine_cls, profile=None, latency_samples=200, batch_repeats=5):
+    """Train an engine in memory and measure its quality and speed"""
+    engine = engine_cls(profile=profile)
+
+    # Retrain without overwriting the saved model to get held-out metrics
+    start = time.perf_counter()
+    engine.train_model(save=False)
+    train_seconds = time.perf_counter() - start
+    evaluation = engine.evaluation
+
+    user_inputs = holdout_inputs(engine)
+
+    # Single-row latency through the full recommendation path
+    sample = [user_inputs[i % len(user_inputs)] for i in range(latency_samples)]
+    sample_iter = iter(sample)
+    single = time_calls(lambda: engine.get_recommendations(next(sample_iter)), latency_samples)
+
+    # Batch throughput over the whole held-out set
+    batch = time_calls(lambda: engine.get_recommendations_batch(user_inputs, k=evaluation['k']), batch_repeats)
+
+    # Model artifact size and load time
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        artifact = os.path.join(tmp_dir, 'model.pkl')
+        joblib.dump((engine.model, engine.pipeline), artifact)
+        artifact_bytes = os.path.getsize(artifact)
+        load = time_calls(lambda: joblib.load(artifact), batch_repeats)
+
+    return {
+        'profile': engine.profile,
+        'accuracy': round(evaluation['accuracy'], 4),
+        'top_k_hit_rate': round(evaluation['top_k_hit_rate'], 4),
+        'k': evaluation['k'],
+        'test_rows': evaluation['rows'],
+        'train_seconds': round(train_seconds, 4),
+        'single_row_latency': latency_summary(single),
+        'batch_rows_per_sec': round(len(user_inputs) / float(batch.min()), 1),
+        'model_load_ms': round(float(load.min()) * 1000, 4),
+        'model_bytes': artifact_bytes
+    }
+
+
+def run(engine_names=None, profiles=None, output=None, latency_samples=200):
+    """Benchmark the selected engines under each model profile and write the results file"""
+    results = {}
+    for name in engine_names or ENGINES:
+        results[name] = {
+            profile: benchmark_engine(ENGINES[name], profile, latency_samples=latency_samples)
+            for profile in profiles or [ModelConfig.DEFAULT_PROFILE]
+        }
+
+    return write_results(results, output or os.path.join(RESULTS_DIR, 'engines.json'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--engines', nargs='+', choices=list(ENGINES), help='Engines to benchmark (default: all)')
+    parser.add_argument('--profiles', nargs='+', choices=list(ModelConfig.PROFILES),
+                        help=f'Model profiles to compare (default: {ModelConfig.DEFAULT_PROFILE})')
+    parser.add_argument('--output', default=os.path.join(RESULTS_DIR, 'engines.json'), help='JSON results file')
+    parser.add_argument('--latency-samples', type=int, default=200, help='Single-row calls to time')
+    args = parser.parse_args()
+
+    payload = run(args.engines, args.profiles, args.output, latency_samples=args.latency_samples)
+    for name, profile_results in payload['results'].items():
+        for profile, result in profile_results.items():
+            latency = result['single_row_latency']
+            print(f"{name:<13} {profile:<9} acc={result['accuracy']:.3f} top{result['k']}={result['top_k_hit_rate']:.3f} "
+                  f"p50={latency['p50_ms']:.2f}ms p99={latency['p99_ms']:.2f}ms "
+                  f"batch={result['batch_rows_per_sec']:,.0f} rows/s load={result['model_load_ms']:.1f}ms "
+                  f"size={result['model_bytes'] / 1e6:.1f}MB")
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+# benchmarks/financial.py
+"""Throughput, memory and equivalence benchmark for the FinancialTools calculators.
+
+Memory is traced with tracemalloc, which tracks live memory but keeps no
+running count of allocations. Each workload therefore reports its peak traced
+memory and the net number of blocks it leaves allocated, not an allocation count.
+
+Run from the repository root:
+
+    python -m benchmarks.financial --output benchmarks/results/financial.json
+    python -m benchmarks.financial --sizes realistic extreme --cases income_tax retirement_needs
+"""
+import argparse
+import functools
+import os
+import tracemalloc
+
+import numpy as np
+
+from benchmarks.common import RESULTS_DIR, latency_summary, time_calls, write_results
+from modules.financial_tools import FinancialTools
+
+# Workload sizes; extreme stretches horizons, country counts and input arrays
+SIZES = {
+    'realistic': {
+        'incomes': 1000, 'countries': 5, 'years': 30, 'returns': 5,
+        'retirement_grid': (10, 10, 10), 'salaries': 50, 'paths': 20000, 'loans': 100
+    },
+    'extreme': {
+        'incomes': 100000, 'countries': 25, 'years': 100, 'returns': 1000,
+        'retirement_grid': (40, 50, 50), 'salaries': 5000, 'paths': 50000, 'loans': 2000
+    }
+}
+
+# Scalar calls timed per case; larger inputs are sampled down to this
+SCALAR_SAMPLE = 500
+
+# Scalar and vectorized results must agree to the cent (or to float precision for large values)
+ABSOLUTE_TOLERANCE = 0.01
+RELATIVE_TOLERANCE = 1e-9
+# Simulated paths accumulate monthly returns in float32
+SIMULATION_RELATIVE_TOLERANCE = 1e-4
+
+
+def uncached(tools, name):
+    """A calculator bound to tools with its memo bypassed, so every call does the work"""
+    method = getattr(FinancialTools, name)
+    return functools.partial(getattr(method, '__wrapped__', method), tools)
+
+
+def measure(func, ops, repeats):
+    """Throughput, latency, peak traced memory and net new blocks of one workload producing ops results"""
+    func()
+    durations = time_calls(func, repeats)
+
+    # Only the final call runs under tracemalloc, which slows allocation down
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    return {
+        'ops': ops,
+        'ops_per_sec': round(ops / float(durations.min()), 1),
+        'latency': latency_summary(durations),
+        'peak_traced_kb': round(peak / 1024, 1),
+        # Blocks allocated during the call and still alive after it, net of frees
+        'net_new_blocks': sum(stat.count_diff for stat in after.compare_to(before, 'filename'))
+    }
+
+
+def compare(reference, *results, rtol=RELATIVE_TOLERANCE):
+    """Largest difference of the results from a reference, and whether they all agree with it"""
+    reference = np.asarray(reference, dtype=float)
+    results = [np.asarray(result, dtype=float) for result in results]
+    return {
+        'max_abs_diff': max(float(np.abs(result - reference).max()) for result in results),
+        'equivalent': all(bool(np.allclose(result, reference, rtol=rtol, atol=ABSOLUTE_TOLERANCE))
+                          for result in results)
+    }
+
+
+# Independent references: plain loops sharing no code with FinancialTools
+
+def reference_income_tax(brackets, income):
+    """Tax from walking the brackets one at a time, or the flat tier rate without brackets"""
+    if brackets is None:
+        for limit, rate in ((30000, 0.15), (70000, 0.25), (120000, 0.35)):
+            if income <= limit:
+                return income * rate
+        return income * 0.45
+
+    tax = 0.0
+    remaining = income
+    for bracket in brackets:
+        if remaining <= 0:
+            break
+        taxable = min(remaining, bracket['max'] - bracket['min'] + 1)
+        tax += taxable * bracket['rate']
+        remaining -= taxable
+    return tax
+
+
+def reference_investment_values(initial_investment, monthly_contribution, years, expected_return):
+    """Year-end portfolio values from compounding month by month, contributing after each month's growth"""
+    value = initial_investment
+    values = []
+    for month in range(1, years * 12 + 1):
+        value = value * (1 + expected_return / 12) + monthly_contribution
+        if month % 12 == 0:
+            values.append(value)
+    return values
+
+
+def reference_total_interest(principal, annual_rate, term_months, extra_payment):
+    """Total interest from paying a loan down period by period"""
+    monthly_rate = annual_rate / 12
+    if monthly_rate:
+        payment = principal * monthly_rate / (1 - (1 + monthly_rate) ** -term_months)
+    else:
+        payment = principal / term_months
+
+    balance = principal
+    total_interest = 0.0
+    for _ in range(term_months):
+        interest = balance * monthly_rate
+        total_interest += interest
+        balance -= min(payment + extra_payment, balance + interest) - interest
+        if balance <= 0.005:
+            break
+    return total_interest
+
+
+def case_result(scalar, vectorized, equivalence):
+    result = {'scalar': scalar, 'vectorized': vectorized, **equivalence}
+    result['speedup'] = round(vectorized['ops_per_sec'] / scalar['ops_per_sec'], 1) if scalar else None
+    return result
+
+
+def bench_income_tax(tools, size, rng, repeats):
+    """calculate_income_tax per call against income_tax_matrix over every country and income"""
+    # Countries beyond the bracket tables take the estimated-rate path
+    countries = list(tools.tax_brackets)
+    countries += [f"Country {i}" for i in range(size['countries'] - len(countries))]
+    incomes = np.round(rng.lognormal(11, 0.8, size['incomes']), 2)
+
+    calculate = uncached(tools, 'calculate_income_tax')
+    sample = [(int(c), int(i)) for c, i in zip(rng.integers(len(countries), size=SCALAR_SAMPLE),
+                                               rng.integers(len(incomes), size=SCALAR_SAMPLE))]
+    scalar_tax = lambda: [calculate(countries[c], float(incomes[i]))['total_tax'] for c, i in sample]
+    matrix = lambda: tools.income_tax_matrix(incomes, countries)
+
+    tax = matrix()['total_tax']
+    reference = [reference_income_tax(tools.tax_brackets.get(countries[c]), float(incomes[i])) for c, i in sample]
+    return case_result(
+        measure(scalar_tax, len(sample), repeats),
+        measure(matrix, len(countries) * len(incomes), repeats),
+        compare(reference, scalar_tax(), [tax[c, i] for c, i in sample])
+    )
+
+
+def bench_investment_growth(tools, size, rng, repeats):
+    """calculate_investment_growth per return rate against one investment_schedule over all rates"""
+    rates = rng.uniform(0.0, 0.12, size['returns'])
+    years = size['years']
+
+    calculate = uncached(tools, 'calculate_investment_growth')
+    sample = rates[:SCALAR_SAMPLE]
+    scalar_values = lambda: [calculate(10000, 500, years, float(rate), include_breakdown=False)['schedule']['value']
+                             for rate in sample]
+    schedule = lambda: tools.investment_schedule(10000, 500, years, rates, yearly=True)
+
+    values = schedule()['value'].to_numpy().reshape(len(rates), years)
+    reference = [reference_investment_values(10000, 500, years, float(rate)) for rate in sample]
+    return case_result(
+        measure(scalar_values, len(sample) * years, repeats),
+        measure(schedule, len(rates) * years, repeats),
+        compare(reference, np.array(scalar_values()), values[:len(sample)])
+    )
+
+
+def bench_retirement_needs(tools, size, rng, repeats):
+    """calculate_retirement_needs per plan against sweep_retirement_needs over the whole grid"""
+    n_ages, n_returns, n_incomes = size['retirement_grid']
+    ages = np.linspace(50, 75, n_ages).astype(int)
+    # The grid starts at a 0% return, where the annuity factor needs its own branch
+    returns = np.linspace(0.0, 0.10, n_returns)
+    incomes = np.linspace(20000, 200000, n_incomes)
+
+    calculate = uncached(tools, 'calculate_retirement_needs')
+    sweep = uncached(tools, 'sweep_retirement_needs')
+    sample = [(0, 0, 0)] + [tuple(int(x) for x in index) for index in zip(
+        rng.integers(n_incomes, size=SCALAR_SAMPLE - 1), rng.integers(n_ages, size=SCALAR_SAMPLE - 1),
+        rng.integers(n_returns, size=SCALAR_SAMPLE - 1)
+    )]
+    scalar_needs = lambda: [
+        calculate(30, int(ages[a]), 50000, float(incomes[i]), expected_return=float(returns[r]))['monthly_savings_needed']
+        for i, a, r in sample
+    ]
+    grid = lambda: sweep(30, 50000, ages, returns, incomes)
+
+    needed = grid()['monthly_savings_needed']
+    return case_result(
+        measure(scalar_needs, len(sample), repeats),
+        measure(grid, n_ages * n_returns * n_incomes, repeats),
+        compare(scalar_needs(), [needed[i, a, r] for i, a, r in sample])
+    )
+
+
+def bench_cost_of_living(tools, size, rng, repeats):
+    """compare_cost_of_living per city pair against net_disposable_income over every city and salary"""
+    cities = tools.cities
+    salaries = np.round(rng.uniform(20000, 300000, size['salaries']), 2)
+
+    calculate = uncached(tools, 'compare_cost_of_living')
+    net_income = uncached(tools, 'net_disposable_income')
+    sample = [(int(a), int(b), int(s)) for a, b, s in zip(
+        rng.integers(len(cities), size=SCALAR_SAMPLE), rng.integers(len(cities), size=SCALAR_SAMPLE),
+        rng.integers(len(salaries), size=SCALAR_SAMPLE)
+    )]
+    scalar_costs = lambda: [calculate(cities[a], cities[b], float(salaries[s]))['current_monthly_col'] * 12
+                            for a, b, s in sample]
+    table = lambda: net_income(salaries, cities)
+
+    # Rows are ordered city by city, salary by salary
+    costs = table()['cost_of_living'].to_numpy().reshape(len(cities), len(salaries))
+    return case_result(
+        measure(scalar_costs, len(sample), repeats),
+        measure(table, len(cities) * len(salaries), repeats),
+        compare(scalar_costs(), [costs[a, s] for a, _, s in sample])
+    )
+
+
+def bench_amortization(tools, size, rng, repeats):
+    """amortization_table per loan against one amortization_schedule over every loan"""
+    n_loans = size['loans']
+    principals = np.round(rng.uniform(10000, 800000, n_loans), 2)
+    rates = np.round(rng.uniform(0.02, 0.09, n_loans), 4)
+    terms = rng.choice([120, 180, 240, 360], n_loans)
+    extras = rng.choice([0.0, 100.0, 500.0], n_loans)
+
+    table = uncached(tools, 'amortization_table')
+    sample = range(min(SCALAR_SAMPLE, n_loans))
+    scalar_interest = lambda: [table(float(principals[i]), float(rates[i]), int(terms[i]), float(extras[i]))['interest'].sum()
+                               for i in sample]
+    schedule = lambda: tools.amortization_schedule(principals, rates, terms, extras)
+
+    interest = schedule()['total_interest']
+    reference = [reference_total_interest(float(principals[i]), float(rates[i]), int(terms[i]), float(extras[i]))
+                 for i in sample]
+    return case_result(
+        measure(scalar_interest, len(sample), repeats),
+        measure(schedule, n_loans, repeats),
+        compare(reference, scalar_interest(), interest[list(sample)])
+    )
+
+
+def bench_monte_carlo(tools, size, rng, repeats):
+    """simulate_investment_growth paths per second; without volatility it must match monthly compounding"""
+    plan = {'initial_investment': 10000, 'monthly_contribution': 500, 'years': size['years'],
+            'expected_return': 0.07}
+    simulate = lambda: tools.simulate_investment_growth(**plan, n_paths=size['paths'],
+                                                        time_budget=float('inf'), seed=42)
+
+    # With zero volatility every path follows the deterministic schedule
+    final_value = tools.simulate_investment_growth(**plan, volatility=0.0, n_paths=100,
+                                                   time_budget=float('inf'), seed=42)['mean_final_value']
+    reference = reference_investment_values(**plan)[-1]
+
+    return case_result(None, measure(simulate, size['paths'], repeats),
+                       compare(reference, final_value, rtol=SIMULATION_RELATIVE_TOLERANCE))
+
+
+CASES = {
+    'income_tax': bench_income_tax,
+    'investment_growth': bench_investment_growth,
+    'retirement_needs': bench_retirement_needs,
+    'cost_of_living': bench_cost_of_living,
+    'amortization': bench_amortization,
+    'monte_carlo': bench_monte_carlo
+}
+
+
+def memo_hit_latency(tools, samples=1000):
+    """Latency of a memoized calculator call that hits the cache"""
+    tools.calculate_income_tax('USA', 75000)
+    return latency_summary(time_calls(lambda: tools.calculate_income_tax('USA', 75000), samples))
+
+
+def run(sizes=None, cases=None, output=None, repeats=5, seed=0):
+    """Benchmark the selected calculators at each size and write the results file"""
+    tools = FinancialTools()
+    results = {
+        size: {
+            case: CASES[case](tools, SIZES[size], np.random.default_rng(seed), repeats)
+            for case in cases or CASES
+        }
+        for size in sizes or ['realistic']
+    }
+    results['memo_hit_latency'] = memo_hit_latency(tools)
+
+    return write_results(results, output or os.path.join(RESULTS_DIR, 'financial.json'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', nargs='+', choices=list(SIZES), help='Workload sizes (default: realistic)')
+    parser.add_argument('--cases', nargs='+', choices=list(CASES), help='Calculators to benchmark (default: all)')
+    parser.add_argument('--output', default=os.path.join(RESULTS_DIR, 'financial.json'), help='JSON results file')
+    parser.add_argument('--repeats', type=int, default=5, help='Timed runs per workload')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the generated inputs')
+    args = parser.parse_args()
+
+    payload = run(args.sizes, args.cases, args.output, repeats=args.repeats, seed=args.seed)
+    results = dict(payload['results'])
+    memo = results.pop('memo_hit_latency')
+    for size, case_results in results.items():
+        for case, result in case_results.items():
+            scalar = f"{result['scalar']['ops_per_sec']:>12,.0f}" if result['scalar'] else f"{'-':>12}"
+            vectorized = result['vectorized']
+            speedup = f"{result['speedup']:,.0f}x" if result['speedup'] else '-'
+            print(f"{size:<9} {case:<17} scalar={scalar} ops/s vectorized={vectorized['ops_per_sec']:>14,.0f} ops/s "
+                  f"speedup={speedup:<7} peak={vectorized['peak_traced_kb'] / 1024:.1f}MB "
+                  f"{'equivalent' if result['equivalent'] else 'MISMATCH'} (max diff {result['max_abs_diff']:.2g})")
+    print(f"memo hit p50={memo['p50_ms'] * 1000:.1f}us")
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
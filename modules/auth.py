@@ -1,63 +1,44 @@
 # modules/auth.py
 # modules/auth.py
 import streamlit as st
-import json
-import hashlib
-import os
 from datetime import datetime
+from modules.passwords import get_hasher, needs_rehash, verify_password
+from modules.write_buffer import get_write_buffer
 
 class Authentication:
     def __init__(self):
         self.users_file = "data/user_data/users.json"
-        self._ensure_users_file()
-    
-    def _ensure_users_file(self):
-        """Create users file if it doesn't exist"""
-        os.makedirs(os.path.dirname(self.users_file), exist_ok=True)
-        if not os.path.exists(self.users_file):
-            with open(self.users_file, 'w') as f:
-                json.dump({}, f)
+        self.db_path = "users.db"
+        self.writes = get_write_buffer(self.db_path, legacy_json_path=self.users_file)
+        self.store = self.writes.store
+        self.hasher = get_hasher()
     
     def _hash_password(self, password):
-        return hashlib.sha256(password.encode()).hexdigest()
-    
-    def _load_users(self):
-        with open(self.users_file, 'r') as f:
-            return json.load(f)
-    
-    def _save_users(self, users):
-        with open(self.users_file, 'w') as f:
-            json.dump(users, f, indent=4)
+        return self.hasher.hash(password)
     
     def register(self, username, password, email):
-        users = self._load_users()
-        
-        if username in users:
-            return False, "Username already exists"
-        
-        users[username] = {
-            'password': self._hash_password(password),
-            'email': email,
-            'created_at': datetime.now().isoformat(),
-            'preferences': {},
-            'search_history': []
-        }
-        
-        self._save_users(users)
-        return True, "Registration successful"
+        return self.store.create_user(
+            username, self._hash_password(password), email, datetime.now().isoformat()
+        )
     
     def login(self, username, password):
-        users = self._load_users()
+        user = self.writes.get_user(username)
         
-        if username in users and users[username]['password'] == self._hash_password(password):
+        if user is not None and verify_password(password, user['password']):
+            # Upgrade unsalted or outdated hashes while the password is at hand
+            if needs_rehash(user['password'], self.hasher):
+                user['password'] = self._hash_password(password)
+                self.store.update_password(username, user['password'])
+            
             st.session_state['authenticated'] = True
             st.session_state['username'] = username
-            st.session_state['user_data'] = users[username]
+            st.session_state['user_data'] = user
             return True, "Login successful"
         
         return False, "Invalid username or password"
     
     def logout(self):
+        self.writes.flush()
         for key in ['authenticated', 'username', 'user_data']:
             if key in st.session_state:
                 del st.session_state[key]
@@ -75,26 +56,19 @@ class Authentication:
     def update_user_preferences(self, preferences):
         if self.is_authenticated():
             username = self.get_current_user()
-            users = self._load_users()
-            users[username]['preferences'] = preferences
-            self._save_users(users)
+            self.writes.update_preferences(username, preferences)
             st.session_state['user_data']['preferences'] = preferences
     
     def add_to_search_history(self, search_data):
         if self.is_authenticated():
             username = self.get_current_user()
-            users = self._load_users()
             
             search_entry = {
                 'timestamp': datetime.now().isoformat(),
                 'data': search_data
             }
             
-            users[username]['search_history'].insert(0, search_entry)
-            # Keep only last 50 searches
-            users[username]['search_history'] = users[username]['search_history'][:50]
-            
-            self._save_users(users)
+            self.writes.add_search(username, search_entry)
     
     def show_login_form(self):
         """Display login/signup form"""
@@ -2,130 +2,136 @@
 import pandas as pd
 import numpy as np
 import os
+from modules import dataset_store, synthetic_data
+from modules.dataset_registry import dataset_registry
 
 class DataLoader:
+    DATASET_FILES = {
+        'student': "student_data.csv",
+        'tourist': "tourist_data.csv",
+        'professional': "professional_data.csv"
+    }
+
+    # Column types of each dataset: a dtype name, or the list of categories
+    SCHEMAS = {
+        'student': {
+            'academic_score': 'int16',
+            'budget': 'int32',
+            'preferred_major': ['Computer Science', 'Business', 'Engineering', 'Arts', 'Medicine', 'Law', 'Social Sciences'],
+            'language_preference': ['English', 'French', 'German', 'Spanish', 'Chinese', 'Japanese', 'Korean'],
+            'degree_level': ['Bachelor', 'Master', 'PhD', 'Diploma'],
+            'country': ['USA', 'UK', 'Canada', 'Australia', 'Germany', 'France', 'Japan', 'Netherlands', 'Sweden']
+        },
+        'tourist': {
+            'budget': 'int32',
+            'travel_style': ['Adventure', 'Cultural', 'Relaxation', 'Food', 'Historical', 'Beach', 'City Break'],
+            'climate_preference': ['Tropical', 'Temperate', 'Cold', 'Mediterranean', 'Desert', 'Mountain'],
+            'duration': 'int16',
+            'travel_companions': ['Solo', 'Couple', 'Family', 'Friends', 'Business'],
+            'season': ['Spring', 'Summer', 'Fall', 'Winter', 'Any'],
+            'destination': ['Italy', 'Japan', 'Thailand', 'USA', 'France', 'Spain', 'Greece', 'Brazil', 'Australia']
+        },
+        'professional': {
+            'experience_years': 'int16',
+            'education_level': ['High School', 'Bachelor', 'Master', 'PhD', 'Diploma/Certificate'],
+            'industry': ['Technology', 'Finance', 'Healthcare', 'Education', 'Engineering',
+                         'Marketing', 'Sales', 'Design', 'Consulting', 'Manufacturing'],
+            'salary_expectation': 'int32',
+            'job_type': ['Full-time', 'Contract', 'Remote', 'Freelance', 'Startup'],
+            'relocation_timeline': ['Immediately', '3-6 months', '6-12 months', '1-2 years', 'Exploring options'],
+            'country': ['USA', 'Germany', 'UK', 'Canada', 'Australia', 'Switzerland', 'Singapore', 'Netherlands', 'UAE']
+        }
+    }
+
     def __init__(self):
         self.data_path = "data/sample_data"
-    
+
+    def get_dataset_path(self, dataset):
+        """Get the CSV path of a named dataset"""
+        return os.path.join(self.data_path, self.DATASET_FILES[dataset])
+
+    def get_store_path(self, dataset):
+        """Get the columnar store directory of a named dataset"""
+        return os.path.splitext(self.get_dataset_path(dataset))[0]
+
+    def load_data(self, dataset):
+        """Load or generate a named dataset ('student', 'tourist' or 'professional').
+
+        The frame is shared through the dataset registry: pandas writes copy
+        on write, but its column arrays are read-only.
+        """
+        store_path = self.get_store_path(dataset)
+        if not dataset_store.dataset_exists(store_path):
+            csv_path = self.get_dataset_path(dataset)
+            if os.path.exists(csv_path):
+                self.import_csv(dataset, csv_path)
+            else:
+                self.generate_data(dataset)
+
+        return dataset_registry.get(
+            store_path,
+            lambda: dataset_store.read_dataset(store_path),
+            marker=os.path.join(store_path, dataset_store.SCHEMA_FILE)
+        )
+
+    def iter_data(self, dataset, chunksize=100_000, columns=None, filters=None):
+        """Stream a named dataset as typed DataFrame chunks.
+
+        columns limits which columns are read, and filters is a list of
+        (column, op, value) tuples such as [('country', '==', 'Germany')]
+        applied while reading; see dataset_store.iter_chunks.
+        """
+        store_path = self.get_store_path(dataset)
+        if not dataset_store.dataset_exists(store_path):
+            self.load_data(dataset)
+        return dataset_store.iter_chunks(store_path, chunksize, columns, filters)
+
+    def import_csv(self, dataset, csv_path):
+        """Convert a CSV dataset into the columnar store (done once per dataset)"""
+        schema = self.SCHEMAS[dataset]
+        dtypes = {col: 'category' if dataset_store.is_categorical(spec) else spec for col, spec in schema.items()}
+        df = pd.read_csv(csv_path, usecols=list(schema), dtype=dtypes)
+        return dataset_store.write_dataset(df, self.get_store_path(dataset), schema)
+
+    def save_data(self, dataset, df):
+        """Save a dataset to the columnar store"""
+        os.makedirs(self.data_path, exist_ok=True)
+        return dataset_store.write_dataset(df, self.get_store_path(dataset), self.SCHEMAS[dataset])
+
     def load_student_data(self):
         """Load or generate student data"""
-        file_path = os.path.join(self.data_path, "student_data.csv")
-        
-        if os.path.exists(file_path):
-            return pd.read_csv(file_path)
-        else:
-            return self.generate_student_data()
-    
+        return self.load_data('student')
+
     def load_tourist_data(self):
         """Load or generate tourist data"""
-        file_path = os.path.join(self.data_path, "tourist_data.csv")
-        
-        if os.path.exists(file_path):
-            return pd.read_csv(file_path)
-        else:
-            return self.generate_tourist_data()
-    
+        return self.load_data('tourist')
+
     def load_professional_data(self):
         """Load or generate professional data"""
-        file_path = os.path.join(self.data_path, "professional_data.csv")
-        
-        if os.path.exists(file_path):
-            return pd.read_csv(file_path)
-        else:
-            return self.generate_professional_data()
-    
-    def generate_student_data(self):
+        return self.load_data('professional')
+
+    def generate_data(self, dataset, n_samples=1000, seed=42, chunksize=1_000_000, path=None):
+        """Generate a synthetic dataset of any size, streaming it to the store chunk by chunk"""
+        schema = self.SCHEMAS[dataset]
+        generate_chunk = synthetic_data.GENERATORS[dataset]
+        rng = np.random.default_rng(seed)
+        path = path or self.get_store_path(dataset)
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with dataset_store.DatasetWriter(path, schema, n_samples) as writer:
+            for start in range(0, n_samples, chunksize):
+                writer.write(generate_chunk(rng, min(chunksize, n_samples - start), schema))
+
+        return path
+
+    def generate_student_data(self, n_samples=1000, seed=42):
         """Generate sample student data"""
-        np.random.seed(42)
-        n_samples = 1000
-        
-        data = {
-            'academic_score': np.random.randint(60, 100, n_samples),
-            'budget': np.random.randint(10000, 50000, n_samples),
-            'preferred_major': np.random.choice(
-                ['Computer Science', 'Business', 'Engineering', 'Arts', 'Medicine', 'Law', 'Social Sciences'], 
-                n_samples
-            ),
-            'language_preference': np.random.choice(
-                ['English', 'French', 'German', 'Spanish', 'Chinese', 'Japanese', 'Korean'], 
-                n_samples
-            ),
-            'degree_level': np.random.choice(['Bachelor', 'Master', 'PhD', 'Diploma'], n_samples),
-            'country': np.random.choice(
-                ['USA', 'UK', 'Canada', 'Australia', 'Germany', 'France', 'Japan', 'Netherlands', 'Sweden'], 
-                n_samples
-            )
-        }
-        
-        df = pd.DataFrame(data)
-        os.makedirs(self.data_path, exist_ok=True)
-        df.to_csv(os.path.join(self.data_path, "student_data.csv"), index=False)
-        return df
-    
-    def generate_tourist_data(self):
+        return dataset_store.read_dataset(self.generate_data('student', n_samples, seed))
+
+    def generate_tourist_data(self, n_samples=1000, seed=42):
         """Generate sample tourist data"""
-        np.random.seed(42)
-        n_samples = 1000
-        
-        data = {
-            'budget': np.random.randint(1000, 10000, n_samples),
-            'travel_style': np.random.choice(
-                ['Adventure', 'Cultural', 'Relaxation', 'Food', 'Historical', 'Beach', 'City Break'], 
-                n_samples
-            ),
-            'climate_preference': np.random.choice(
-                ['Tropical', 'Temperate', 'Cold', 'Mediterranean', 'Desert', 'Mountain'], 
-                n_samples
-            ),
-            'duration': np.random.randint(3, 30, n_samples),
-            'travel_companions': np.random.choice(
-                ['Solo', 'Couple', 'Family', 'Friends', 'Business'], 
-                n_samples
-            ),
-            'season': np.random.choice(['Spring', 'Summer', 'Fall', 'Winter', 'Any'], n_samples),
-            'destination': np.random.choice(
-                ['Italy', 'Japan', 'Thailand', 'USA', 'France', 'Spain', 'Greece', 'Brazil', 'Australia'], 
-                n_samples
-            )
-        }
-        
-        df = pd.DataFrame(data)
-        os.makedirs(self.data_path, exist_ok=True)
-        df.to_csv(os.path.join(self.data_path, "tourist_data.csv"), index=False)
-        return df
-    
-    def generate_professional_data(self):
+        return dataset_store.read_dataset(self.generate_data('tourist', n_samples, seed))
+
+    def generate_professional_data(self, n_samples=1000, seed=42):
         """Generate sample professional data"""
-        np.random.seed(42)
-        n_samples = 1000
-        
-        data = {
-            'experience_years': np.random.randint(0, 30, n_samples),
-            'education_level': np.random.choice(
-                ['High School', 'Bachelor', 'Master', 'PhD', 'Diploma/Certificate'], 
-                n_samples
-            ),
-            'industry': np.random.choice(
-                ['Technology', 'Finance', 'Healthcare', 'Education', 'Engineering', 
-                 'Marketing', 'Sales', 'Design', 'Consulting', 'Manufacturing'], 
-                n_samples
-            ),
-            'salary_expectation': np.random.randint(30000, 200000, n_samples),
-            'job_type': np.random.choice(
-                ['Full-time', 'Contract', 'Remote', 'Freelance', 'Startup'], 
-                n_samples
-            ),
-            'relocation_timeline': np.random.choice(
-                ['Immediately', '3-6 months', '6-12 months', '1-2 years', 'Exploring options'], 
-                n_samples
-            ),
-            'country': np.random.choice(
-                ['USA', 'Germany', 'UK', 'Canada', 'Australia', 'Switzerland', 'Singapore', 'Netherlands', 'UAE'], 
-                n_samples
-            )
-        }
-        
-        df = pd.DataFrame(data)
-        os.makedirs(self.data_path, exist_ok=True)
-        df.to_csv(os.path.join(self.data_path, "professional_data.csv"), index=False)
-        return df
+        return dataset_store.read_dataset(self.generate_data('professional', n_samples, seed))
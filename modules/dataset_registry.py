@@ -0,0 +1,73 @@
+# modules/dataset_registry.py
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+class DatasetRegistry:
+    """Process-wide cache of loaded datasets, shared by the engines and pages.
+
+    Each dataset is loaded once per process and keyed by its path and the
+    modification stamp of a marker file, so rewriting the dataset invalidates
+    the cached copy on the next lookup. Callers get shallow copies over
+    read-only column arrays. Under pandas copy-on-write, writes through the
+    frame (df.loc[...] = ..., column assignment) silently copy the affected
+    columns and leave the cache untouched; only writes into the raw arrays
+    from Series.to_numpy() or .values raise ValueError.
+    """
+
+    def __init__(self):
+        self._cache = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _stamp(marker_path):
+        stat = os.stat(marker_path)
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    @staticmethod
+    def _read_only(df):
+        columns = {}
+        for col in df.columns:
+            if isinstance(df[col].dtype, pd.CategoricalDtype):
+                codes = np.array(df[col].cat.codes)
+                codes.flags.writeable = False
+                columns[col] = pd.Categorical.from_codes(codes, dtype=df[col].dtype)
+            else:
+                values = np.array(df[col])
+                values.flags.writeable = False
+                columns[col] = values
+        return pd.DataFrame(columns, copy=False)
+
+    def get(self, path, loader, marker=None):
+        """Return a read-only view of the dataset at path, calling loader() on a miss.
+
+        marker is the file whose modification marks a change (default: path).
+        """
+        key = os.path.abspath(path)
+        stamp = self._stamp(marker or path)
+
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] == stamp:
+                self.hits += 1
+            else:
+                self.misses += 1
+                cached = (stamp, self._read_only(loader()))
+                self._cache[key] = cached
+
+        return cached[1].copy(deep=False)
+
+    def invalidate(self, path=None):
+        """Drop one cached dataset, or all of them"""
+        with self._lock:
+            if path is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(os.path.abspath(path), None)
+
+# Global instance
+dataset_registry = DatasetRegistry()
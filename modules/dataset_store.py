@@ -0,0 +1,230 @@
+# modules/dataset_store.py
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+# Typed columnar storage for the DataLoader datasets.
+#
+# A dataset is a directory holding one .npy file per column and a schema.json
+# describing the columns. A schema maps each column to either a NumPy dtype
+# name ('int32') or a list of categories; categorical columns are stored as
+# their integer codes. Columns load without any parsing or dtype inference and
+# can be memory-mapped, so a column or a slice of rows can be read without
+# loading the rest of the dataset.
+
+SCHEMA_FILE = "schema.json"
+FORMAT_VERSION = 1
+
+
+def is_categorical(spec):
+    return isinstance(spec, list)
+
+
+def apply_schema(df, schema):
+    """Return the schema's columns of df with the schema's dtypes"""
+    typed = {}
+    for col, spec in schema.items():
+        if is_categorical(spec):
+            values = pd.Categorical(df[col], categories=spec)
+            unknown = pd.isna(values) & pd.notna(df[col]).to_numpy()
+            if unknown.any():
+                raise ValueError(f"Column '{col}' has values outside its schema: "
+                                 f"{sorted(set(df[col][unknown]))[:5]}")
+            typed[col] = values
+        else:
+            typed[col] = df[col].to_numpy(dtype=spec)
+    return pd.DataFrame(typed)
+
+
+def dataset_exists(path):
+    return os.path.exists(os.path.join(path, SCHEMA_FILE))
+
+
+def code_dtype(categories):
+    """Smallest integer dtype that holds the codes of a categorical column"""
+    return np.int8 if len(categories) < 128 else np.int16 if len(categories) < 32768 else np.int32
+
+
+def encode_columns(df, schema):
+    """Convert a typed DataFrame into the arrays stored on disk"""
+    return {
+        col: df[col].cat.codes.to_numpy() if is_categorical(spec) else df[col].to_numpy()
+        for col, spec in schema.items()
+    }
+
+
+class DatasetWriter:
+    """Writes a dataset of known size chunk by chunk, holding only one chunk in memory"""
+
+    def __init__(self, path, schema, rows):
+        self.path = path
+        self.schema = schema
+        self.rows = rows
+        self.position = 0
+        self.tmp_path = path + ".tmp"
+
+        shutil.rmtree(self.tmp_path, ignore_errors=True)
+        os.makedirs(self.tmp_path)
+        self.columns = {
+            col: np.lib.format.open_memmap(
+                os.path.join(self.tmp_path, f"{col}.npy"), mode='w+', shape=(rows,),
+                dtype=code_dtype(spec) if is_categorical(spec) else spec
+            )
+            for col, spec in schema.items()
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.columns = {}
+            shutil.rmtree(self.tmp_path, ignore_errors=True)
+
+    def write(self, chunk):
+        """Append encoded columns (category codes for categorical columns)"""
+        n_rows = len(next(iter(chunk.values())))
+        if self.position + n_rows > self.rows:
+            raise ValueError(f"Dataset {self.path} was sized for {self.rows} rows")
+
+        for col, values in chunk.items():
+            self.columns[col][self.position:self.position + n_rows] = values
+        self.position += n_rows
+
+    def close(self):
+        """Flush the columns and publish the dataset"""
+        if self.position != self.rows:
+            raise ValueError(f"Dataset {self.path} has {self.position} of {self.rows} rows")
+
+        for values in self.columns.values():
+            values.flush()
+        self.columns = {}
+
+        # The schema is written last; a directory without one is incomplete
+        with open(os.path.join(self.tmp_path, SCHEMA_FILE), 'w') as f:
+            json.dump({'version': FORMAT_VERSION, 'rows': self.rows, 'columns': self.schema}, f, indent=4)
+
+        shutil.rmtree(self.path, ignore_errors=True)
+        os.replace(self.tmp_path, self.path)
+
+
+def write_dataset(df, path, schema):
+    """Write df to a columnar dataset directory, replacing any existing one"""
+    typed = apply_schema(df, schema)
+    with DatasetWriter(path, schema, len(typed)) as writer:
+        writer.write(encode_columns(typed, schema))
+    return typed
+
+
+def read_schema(path):
+    """Read a dataset's schema file"""
+    with open(os.path.join(path, SCHEMA_FILE)) as f:
+        schema = json.load(f)
+    if schema.get('version') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported dataset format version {schema.get('version')} in {path}")
+    return schema
+
+
+def _column(path, col, spec, mmap_mode=None):
+    values = np.load(os.path.join(path, f"{col}.npy"), mmap_mode=mmap_mode)
+    if is_categorical(spec):
+        return pd.Categorical.from_codes(values, categories=spec)
+    return values
+
+
+def read_dataset(path, columns=None):
+    """Load a dataset, or only some of its columns, as a typed DataFrame"""
+    schema = read_schema(path)['columns']
+    columns = columns or list(schema)
+    return pd.DataFrame({col: _column(path, col, schema[col]) for col in columns})
+
+
+FILTER_OPS = {
+    '==': np.equal,
+    '!=': np.not_equal,
+    '<': np.less,
+    '<=': np.less_equal,
+    '>': np.greater,
+    '>=': np.greater_equal
+}
+
+
+def _filter_mask(block, schema, filters):
+    """Rows of an encoded block matching every (column, op, value) filter"""
+    mask = np.ones(len(next(iter(block.values()))), dtype=bool)
+
+    for col, op, value in filters:
+        spec = schema[col]
+        if is_categorical(spec):
+            # Compare category codes rather than strings
+            if op in ('in', 'not in'):
+                value = [spec.index(v) for v in value if v in spec]
+            elif op in ('==', '!='):
+                value = spec.index(value) if value in spec else -2
+            else:
+                raise ValueError(f"Operator '{op}' is not supported on categorical column '{col}'")
+
+        if op == 'in':
+            mask &= np.isin(block[col], value)
+        elif op == 'not in':
+            mask &= ~np.isin(block[col], value)
+        elif op in FILTER_OPS:
+            mask &= FILTER_OPS[op](block[col], value)
+        else:
+            raise ValueError(f"Unknown filter operator '{op}'")
+
+    return mask
+
+
+def _decode(block, schema):
+    return pd.DataFrame({
+        col: pd.Categorical.from_codes(values, categories=schema[col]) if is_categorical(schema[col]) else values
+        for col, values in block.items()
+    })
+
+
+def iter_chunks(path, chunksize, columns=None, filters=None):
+    """Yield typed DataFrames of chunksize rows (the last may be shorter).
+
+    Only the requested columns, plus any used by filters, are read from disk.
+    filters is a list of (column, op, value) tuples combined with AND, where
+    op is one of ==, !=, <, <=, >, >=, in, not in; they are applied to each
+    block as it is read, so matching rows are regrouped into full chunks.
+    """
+    info = read_schema(path)
+    schema = info['columns']
+    columns = list(columns or schema)
+    filters = list(filters or [])
+
+    needed = columns + [col for col, _, _ in filters if col not in columns]
+    for col in needed:
+        if col not in schema:
+            raise KeyError(f"Dataset {path} has no column '{col}'")
+    arrays = {col: np.load(os.path.join(path, f"{col}.npy"), mmap_mode='r') for col in needed}
+
+    pending = []
+    pending_rows = 0
+    for start in range(0, info['rows'], chunksize):
+        block = {col: np.array(arrays[col][start:start + chunksize]) for col in needed}
+        if filters:
+            mask = _filter_mask(block, schema, filters)
+            block = {col: block[col][mask] for col in columns}
+
+        pending.append(block)
+        pending_rows += len(block[columns[0]])
+
+        while pending_rows >= chunksize:
+            merged = pending[0] if len(pending) == 1 else {
+                col: np.concatenate([part[col] for part in pending]) for col in columns
+            }
+            yield _decode({col: merged[col][:chunksize] for col in columns}, schema)
+            pending = [{col: merged[col][chunksize:] for col in columns}]
+            pending_rows -= chunksize
+
+    if pending_rows:
+        yield _decode({col: np.concatenate([part[col] for part in pending]) for col in columns}, schema)
@@ -3,101 +3,157 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
+import copy
+import functools
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from modules.api_services import api_services
+from modules.reference_data import REFERENCE_DIR, load_reference_data
+from utils.config import SimulationConfig
+
+# Income tiers and flat rates used for countries without bracket data
+ESTIMATED_TAX_TIERS = np.array([30000, 70000, 120000])
+ESTIMATED_TAX_RATES = np.array([0.15, 0.25, 0.35, 0.45])
+
+# Insurance price adjustments, and monthly prices for countries without insurance data
+INSURANCE_COVERAGE_MULTIPLIERS = {'basic': 0.7, 'standard': 1.0, 'premium': 1.5}
+ESTIMATED_INSURANCE_COSTS = {'health': 300, 'car': 100, 'renters': 15, 'life': 25}
+
+# Order in which savings goals are funded
+GOAL_PRIORITIES = {'high': 0, 'medium': 1, 'low': 2}
+
+# Currency every calculator works in, and result fields that are not amounts of money
+BASE_CURRENCY = 'USD'
+NON_MONETARY_FIELDS = frozenset([
+    'effective_tax_rate', 'expected_return', 'expected_returns', 'col_ratio', 'age', 'current_age',
+    'retirement_age', 'retirement_ages', 'working_years', 'retirement_years', 'years', 'year', 'month',
+    'timeframe', 'timeframe_months', 'payoff_month', 'months_saved', 'paths', 'probability_of_goal',
+    'funded_ratio_percentiles', 'elapsed_seconds'
+])
+
+# Results kept per FinancialTools instance by the memoized calculators
+MEMO_SIZE = 1024
+
+# Seconds between checks of the reference files for edits
+REFERENCE_CHECK_INTERVAL = 1.0
+IMMUTABLE_TYPES = (int, float, str, bool, type(None), np.generic)
+
+
+def _freeze(value):
+    """Hashable form of a calculator argument"""
+    if isinstance(value, np.ndarray):
+        return ('ndarray', value.dtype.str, value.shape, value.tobytes())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    # 75000 and 75000.0 hash alike but produce differently typed results
+    return (type(value).__name__, value)
+
+
+def _copy_result(value):
+    """Copy of a calculator result, sharing only immutable values"""
+    if isinstance(value, IMMUTABLE_TYPES):
+        return value
+    if isinstance(value, dict):
+        return {key: item if isinstance(item, IMMUTABLE_TYPES) else _copy_result(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_result(item) for item in value]
+    if isinstance(value, (pd.DataFrame, pd.Series, np.ndarray)):
+        return value.copy()
+    return copy.deepcopy(value)
+
+
+def memoized(method):
+    """Cache a pure calculator's results in a bounded LRU.
+    
+    Results are keyed on the method, its arguments and the digest of the
+    reference tables, so results computed from tables that have since been
+    edited stop being served once the edit is picked up (see
+    FinancialTools.reference). Callers get copies and may modify them freely.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            key = (method.__name__, self.reference.digest, _freeze(args), _freeze(kwargs))
+            hash(key)
+        except TypeError:
+            return method(self, *args, **kwargs)
+        
+        with self._memo_lock:
+            result = self._memo.get(key)
+            if result is not None:
+                self._memo.move_to_end(key)
+                self.memo_hits += 1
+        
+        if result is None:
+            result = method(self, *args, **kwargs)
+            with self._memo_lock:
+                self.memo_misses += 1
+                self._memo[key] = result
+                if len(self._memo) > MEMO_SIZE:
+                    self._memo.popitem(last=False)
+        
+        return _copy_result(result)
+    
+    return wrapper
+
+
+def _reference_table(name):
+    """Read-only attribute that always reflects the current reference tables"""
+    return property(lambda self: getattr(self.reference, name))
+
 
 class FinancialTools:
     """Comprehensive financial planning and analysis tools"""
     
-    def __init__(self):
-        self.cost_of_living_data = self._load_cost_of_living_data()
-        self.tax_brackets = self._load_tax_brackets()
-        self.insurance_data = self._load_insurance_data()
+    # Validated tables shared across instances; treat them as read-only
+    cost_of_living_data = _reference_table('cost_of_living')
+    tax_brackets = _reference_table('tax_brackets')
+    insurance_data = _reference_table('insurance')
+    city_countries = _reference_table('city_countries')
     
-    def _load_cost_of_living_data(self):
-        """Load cost of living data for major cities"""
-        return {
-            'New York': {'rent_1bed': 3200, 'utilities': 150, 'groceries': 400, 'transport': 127, 'total': 4500},
-            'London': {'rent_1bed': 1800, 'utilities': 160, 'groceries': 300, 'transport': 150, 'total': 2800},
-            'Tokyo': {'rent_1bed': 1100, 'utilities': 150, 'groceries': 350, 'transport': 70, 'total': 2000},
-            'Berlin': {'rent_1bed': 900, 'utilities': 120, 'groceries': 250, 'transport': 80, 'total': 1600},
-            'Sydney': {'rent_1bed': 1600, 'utilities': 140, 'groceries': 350, 'transport': 110, 'total': 2500},
-            'Toronto': {'rent_1bed': 1500, 'utilities': 120, 'groceries': 300, 'transport': 100, 'total': 2200},
-            'Singapore': {'rent_1bed': 1800, 'utilities': 100, 'groceries': 350, 'transport': 80, 'total': 2600},
-            'Dubai': {'rent_1bed': 1400, 'utilities': 120, 'groceries': 300, 'transport': 90, 'total': 2100}
-        }
+    # Indexed forms used by the vectorized engines
+    tax_schedules = _reference_table('tax_schedules')
+    cities = _reference_table('cities')
+    city_positions = _reference_table('city_positions')
+    city_monthly_costs = _reference_table('city_monthly_costs')
+    insurance_monthly_totals = _reference_table('insurance_monthly_totals')
     
-    def _load_tax_brackets(self):
-        """Load tax brackets for different countries"""
-        return {
-            'USA': [
-                {'min': 0, 'max': 11000, 'rate': 0.10},
-                {'min': 11001, 'max': 44725, 'rate': 0.12},
-                {'min': 44726, 'max': 95375, 'rate': 0.22},
-                {'min': 95376, 'max': 182100, 'rate': 0.24},
-                {'min': 182101, 'max': 231250, 'rate': 0.32},
-                {'min': 231251, 'max': 578125, 'rate': 0.35},
-                {'min': 578126, 'max': float('inf'), 'rate': 0.37}
-            ],
-            'UK': [
-                {'min': 0, 'max': 12570, 'rate': 0.0},
-                {'min': 12571, 'max': 50270, 'rate': 0.20},
-                {'min': 50271, 'max': 125140, 'rate': 0.40},
-                {'min': 125141, 'max': float('inf'), 'rate': 0.45}
-            ],
-            'Germany': [
-                {'min': 0, 'max': 10908, 'rate': 0.0},
-                {'min': 10909, 'max': 62809, 'rate': 0.14},
-                {'min': 62810, 'max': 277825, 'rate': 0.42},
-                {'min': 277826, 'max': float('inf'), 'rate': 0.45}
-            ],
-            'Canada': [
-                {'min': 0, 'max': 53359, 'rate': 0.15},
-                {'min': 53360, 'max': 106717, 'rate': 0.205},
-                {'min': 106718, 'max': 165430, 'rate': 0.26},
-                {'min': 165431, 'max': 235675, 'rate': 0.29},
-                {'min': 235676, 'max': float('inf'), 'rate': 0.33}
-            ],
-            'Australia': [
-                {'min': 0, 'max': 18200, 'rate': 0.0},
-                {'min': 18201, 'max': 45000, 'rate': 0.19},
-                {'min': 45001, 'max': 120000, 'rate': 0.325},
-                {'min': 120001, 'max': 180000, 'rate': 0.37},
-                {'min': 180001, 'max': float('inf'), 'rate': 0.45}
-            ]
-        }
+    def __init__(self, reference_path=REFERENCE_DIR):
+        self.reference_path = reference_path
+        self._reference = load_reference_data(reference_path)
+        self._reference_checked = time.monotonic()
+        
+        self._memo = OrderedDict()
+        self._memo_lock = threading.Lock()
+        self.memo_hits = 0
+        self.memo_misses = 0
     
-    def _load_insurance_data(self):
-        """Load average insurance costs by country"""
-        return {
-            'USA': {'health': 450, 'car': 150, 'renters': 20, 'life': 30},
-            'UK': {'health': 200, 'car': 80, 'renters': 15, 'life': 25},
-            'Germany': {'health': 400, 'car': 70, 'renters': 12, 'life': 20},
-            'Canada': {'health': 150, 'car': 100, 'renters': 18, 'life': 28},
-            'Australia': {'health': 180, 'car': 90, 'renters': 16, 'life': 22},
-            'Japan': {'health': 250, 'car': 60, 'renters': 10, 'life': 18}
-        }
+    @property
+    def reference(self):
+        """Current reference tables; edited files are picked up within REFERENCE_CHECK_INTERVAL"""
+        now = time.monotonic()
+        if now - self._reference_checked >= REFERENCE_CHECK_INTERVAL:
+            self._reference = load_reference_data(self.reference_path)
+            self._reference_checked = now
+        return self._reference
+    
+    def clear_memo(self):
+        """Drop all memoized calculator results"""
+        with self._memo_lock:
+            self._memo.clear()
     
     # ===== TAX CALCULATORS =====
+    @memoized
     def calculate_income_tax(self, country, annual_income, filing_status='single'):
         """Calculate income tax for a specific country"""
-        if country not in self.tax_brackets:
+        if country not in self.tax_schedules:
             return self._estimate_tax(annual_income)
         
-        brackets = self.tax_brackets[country]
-        tax = 0
-        remaining_income = annual_income
-        
-        for bracket in brackets:
-            if remaining_income <= 0:
-                break
-            
-            bracket_range = bracket['max'] - bracket['min'] + 1
-            taxable_in_bracket = min(remaining_income, bracket_range)
-            
-            if taxable_in_bracket > 0:
-                tax += taxable_in_bracket * bracket['rate']
-                remaining_income -= taxable_in_bracket
+        tax = float(self.tax_schedules[country].tax(annual_income))
         
         # Calculate effective tax rate
         effective_rate = tax / annual_income if annual_income > 0 else 0
@@ -113,15 +169,7 @@ class FinancialTools:
     def _estimate_tax(self, annual_income):
         """Estimate tax for countries without specific brackets"""
         # Simple progressive estimation
-        if annual_income <= 30000:
-            tax_rate = 0.15
-        elif annual_income <= 70000:
-            tax_rate = 0.25
-        elif annual_income <= 120000:
-            tax_rate = 0.35
-        else:
-            tax_rate = 0.45
-        
+        tax_rate = float(self._estimated_tax_rates(annual_income))
         tax = annual_income * tax_rate
         
         return {
@@ -132,19 +180,110 @@ class FinancialTools:
             'monthly_net': round((annual_income - tax) / 12, 2)
         }
     
+    def _estimated_tax_rates(self, incomes):
+        """Flat rate of each income's tier, for countries without specific brackets"""
+        return ESTIMATED_TAX_RATES[np.searchsorted(ESTIMATED_TAX_TIERS, incomes, side='left')]
+    
+    def income_tax_matrix(self, incomes, countries=None):
+        """Tax on every income in every country, as (countries x incomes) arrays.
+        
+        Countries without bracket data use the same estimate as calculate_income_tax.
+        """
+        countries = list(countries if countries is not None else self.tax_schedules)
+        incomes = np.atleast_1d(np.asarray(incomes, dtype=float))
+        
+        total_tax = np.empty((len(countries), len(incomes)))
+        for i, country in enumerate(countries):
+            if country in self.tax_schedules:
+                total_tax[i] = self.tax_schedules[country].tax(incomes)
+            else:
+                total_tax[i] = incomes * self._estimated_tax_rates(incomes)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            effective_rate = np.where(incomes > 0, total_tax / incomes, 0.0)
+        
+        return {
+            'countries': countries,
+            'incomes': incomes,
+            'total_tax': total_tax,
+            'net_income': incomes - total_tax,
+            'effective_tax_rate': effective_rate
+        }
+    
+    def calculate_income_tax_batch(self, incomes, countries=None):
+        """Calculate income tax for an array of incomes across countries (default: all).
+        
+        Returns a long DataFrame with one row per country and income and the
+        columns of calculate_income_tax, unrounded.
+        """
+        matrix = self.income_tax_matrix(incomes, countries)
+        n_countries, n_incomes = matrix['total_tax'].shape
+        
+        return pd.DataFrame({
+            'country': pd.Categorical.from_codes(np.repeat(np.arange(n_countries), n_incomes), matrix['countries']),
+            'gross_income': np.tile(matrix['incomes'], n_countries),
+            'total_tax': matrix['total_tax'].ravel(),
+            'net_income': matrix['net_income'].ravel(),
+            'effective_tax_rate': matrix['effective_tax_rate'].ravel(),
+            'monthly_net': matrix['net_income'].ravel() / 12
+        })
+    
+    @memoized
     def compare_taxes_across_countries(self, annual_income):
         """Compare tax burden across different countries"""
-        comparison = {}
+        matrix = self.income_tax_matrix([annual_income])
         
-        for country in self.tax_brackets.keys():
-            tax_data = self.calculate_income_tax(country, annual_income)
-            comparison[country] = tax_data
+        comparison = {}
+        for i, country in enumerate(matrix['countries']):
+            tax = float(matrix['total_tax'][i, 0])
+            comparison[country] = {
+                'gross_income': annual_income,
+                'total_tax': round(tax, 2),
+                'net_income': round(annual_income - tax, 2),
+                'effective_tax_rate': round(float(matrix['effective_tax_rate'][i, 0]), 4),
+                'monthly_net': round((annual_income - tax) / 12, 2)
+            }
         
         return comparison
     
     # ===== INVESTMENT PLANNING =====
-    def calculate_investment_growth(self, initial_investment, monthly_contribution, years, expected_return=0.07):
-        """Calculate compound investment growth"""
+    def _growth_matrix(self, initial_investment, monthly_contribution, months, rates):
+        """Portfolio value after each of months (columns) for each annual rate (rows), in closed form"""
+        monthly_rates = np.asarray(rates, dtype=float)[:, None] / 12
+        growth = (1 + monthly_rates) ** months
+        # Future value of an annuity; its limit is the number of months at a zero rate
+        with np.errstate(divide='ignore', invalid='ignore'):
+            annuity = np.where(monthly_rates == 0, months, (growth - 1) / monthly_rates)
+        return initial_investment * growth + monthly_contribution * annuity
+    
+    def investment_schedule(self, initial_investment, monthly_contribution, years, expected_returns=0.07,
+                            yearly=False):
+        """Month-end portfolio values for one or more annual return rates.
+        
+        Returns a long DataFrame with one row per return rate and month (or
+        year-end only, if yearly) and the columns expected_return, month,
+        year, value, contributions and earnings. Contributions are added at
+        the end of each month, after that month's growth.
+        """
+        rates = np.atleast_1d(np.asarray(expected_returns, dtype=float))
+        step = 12 if yearly else 1
+        months = np.arange(step, years * 12 + 1, step)
+        
+        values = self._growth_matrix(initial_investment, monthly_contribution, months, rates)
+        contributions = initial_investment + monthly_contribution * months.astype(float)
+        
+        return pd.DataFrame({
+            'expected_return': np.repeat(rates, len(months)),
+            'month': np.tile(months, len(rates)),
+            'year': np.tile(months / 12, len(rates)),
+            'value': values.ravel(),
+            'contributions': np.tile(contributions, len(rates)),
+            'earnings': (values - contributions).ravel()
+        })
+    
+    def _investment_summary(self, initial_investment, monthly_contribution, years, expected_return, values,
+                            include_breakdown):
+        """Totals of one return scenario, with its year-end schedule from values"""
         monthly_rate = expected_return / 12
         months = years * 12
         
@@ -152,37 +291,59 @@ class FinancialTools:
         future_value_initial = initial_investment * (1 + expected_return) ** years
         
         # Future value of monthly contributions
-        future_value_contributions = monthly_contribution * (((1 + monthly_rate) ** months - 1) / monthly_rate)
+        future_value_contributions = (monthly_contribution * (((1 + monthly_rate) ** months - 1) / monthly_rate)
+                                      if monthly_rate else monthly_contribution * months)
         
         total_value = future_value_initial + future_value_contributions
         total_contributions = initial_investment + (monthly_contribution * months)
         total_earnings = total_value - total_contributions
         
-        # Year-by-year breakdown
-        yearly_breakdown = []
-        current_value = initial_investment
-        
-        for year in range(1, years + 1):
-            # Add monthly contributions for the year
-            for month in range(12):
-                current_value = current_value * (1 + monthly_rate) + monthly_contribution
-            
-            yearly_breakdown.append({
-                'year': year,
-                'value': round(current_value, 2),
-                'contributions': initial_investment + (monthly_contribution * year * 12),
-                'earnings': round(current_value - (initial_investment + (monthly_contribution * year * 12)), 2)
-            })
+        year_list = np.arange(1, years + 1)
+        contributions = initial_investment + monthly_contribution * 12 * year_list
         
-        return {
+        result = {
             'total_value': round(total_value, 2),
             'total_contributions': round(total_contributions, 2),
             'total_earnings': round(total_earnings, 2),
-            'yearly_breakdown': yearly_breakdown,
+            'schedule': pd.DataFrame({
+                'year': year_list,
+                'value': values,
+                'contributions': contributions.astype(float),
+                'earnings': values - contributions
+            }),
             'expected_return': expected_return
         }
+        
+        if include_breakdown:
+            # Year-by-year breakdown
+            result['yearly_breakdown'] = [
+                {'year': year, 'value': round(value, 2),
+                 'contributions': initial_investment + (monthly_contribution * year * 12),
+                 'earnings': round(value - (initial_investment + (monthly_contribution * year * 12)), 2)}
+                for year, value in zip(year_list.tolist(), values.tolist())
+            ]
+        
+        return result
     
-    def compare_investment_strategies(self, initial_investment, monthly_contribution, years):
+    @memoized
+    def calculate_investment_growth(self, initial_investment, monthly_contribution, years, expected_return=0.07,
+                                    include_breakdown=True):
+        """Calculate compound investment growth.
+        
+        'schedule' holds the year-end values as a DataFrame; the
+        'yearly_breakdown' list of dicts is only built if include_breakdown.
+        """
+        values = self._growth_matrix(
+            initial_investment, monthly_contribution, np.arange(12, years * 12 + 1, 12), [expected_return]
+        )[0]
+        
+        return self._investment_summary(
+            initial_investment, monthly_contribution, years, expected_return, values, include_breakdown
+        )
+    
+    @memoized
+    def compare_investment_strategies(self, initial_investment, monthly_contribution, years,
+                                      include_breakdown=True):
         """Compare different investment return scenarios"""
         strategies = {
             'Conservative (4%)': 0.04,
@@ -190,17 +351,23 @@ class FinancialTools:
             'Aggressive (10%)': 0.10
         }
         
+        # Every scenario's year-end values in one computation
+        values = self._growth_matrix(
+            initial_investment, monthly_contribution, np.arange(12, years * 12 + 1, 12), list(strategies.values())
+        )
+        
         results = {}
-        for strategy_name, return_rate in strategies.items():
-            results[strategy_name] = self.calculate_investment_growth(
-                initial_investment, monthly_contribution, years, return_rate
+        for i, (strategy_name, return_rate) in enumerate(strategies.items()):
+            results[strategy_name] = self._investment_summary(
+                initial_investment, monthly_contribution, years, return_rate, values[i], include_breakdown
             )
         
         return results
     
     # ===== RETIREMENT PLANNING =====
+    @memoized
     def calculate_retirement_needs(self, current_age, retirement_age, current_savings, 
-                                 desired_retirement_income, life_expectancy=85):
+                                 desired_retirement_income, life_expectancy=85, expected_return=0.07):
         """Calculate retirement savings needs"""
         retirement_years = life_expectancy - retirement_age
         working_years = retirement_age - current_age
@@ -211,8 +378,7 @@ class FinancialTools:
         # Calculate total retirement fund needed (4% withdrawal rule)
         total_needed = (inflation_adjusted_income * retirement_years) / 0.04
         
-        # Calculate required monthly savings
-        expected_return = 0.07  # 7% average market return
+        # Calculate required monthly savings (7% average market return by default)
         monthly_return = expected_return / 12
         months_to_save = working_years * 12
         
@@ -224,6 +390,9 @@ class FinancialTools:
         
         if additional_needed <= 0:
             monthly_savings_needed = 0
+        elif monthly_return == 0:
+            # Without growth the gap is simply split across the months left
+            monthly_savings_needed = additional_needed / months_to_save
         else:
             monthly_savings_needed = additional_needed * (monthly_return / ((1 + monthly_return) ** months_to_save - 1))
         
@@ -238,6 +407,54 @@ class FinancialTools:
             'inflation_adjusted_income': round(inflation_adjusted_income, 2)
         }
     
+    @memoized
+    def sweep_retirement_needs(self, current_age, current_savings, retirement_ages, expected_returns,
+                               desired_incomes, life_expectancy=85):
+        """Evaluate calculate_retirement_needs over a full parameter grid in one computation.
+        
+        Returns the grid axes and, for each result of calculate_retirement_needs
+        that depends on them, an unrounded array of shape
+        (len(desired_incomes), len(retirement_ages), len(expected_returns)),
+        so result['monthly_savings_needed'][i] is a ready-made heatmap of
+        retirement age against return rate for the i-th income.
+        """
+        ages = np.asarray(retirement_ages, dtype=float)
+        rates = np.asarray(expected_returns, dtype=float)
+        incomes = np.asarray(desired_incomes, dtype=float)
+        if (ages <= current_age).any():
+            raise ValueError("Retirement ages must be greater than the current age")
+        
+        # Broadcast to (income, age, return)
+        income = incomes[:, None, None]
+        working_years = (ages - current_age)[None, :, None]
+        retirement_years = (life_expectancy - ages)[None, :, None]
+        annual_return = rates[None, None, :]
+        
+        # Same model as calculate_retirement_needs: 3% inflation, 4% withdrawal rule
+        inflation_adjusted_income = income * (1.03 ** working_years)
+        total_needed = (inflation_adjusted_income * retirement_years) / 0.04
+        future_current_savings = current_savings * (1 + annual_return) ** working_years
+        additional_needed = total_needed - future_current_savings
+        
+        monthly_return = annual_return / 12
+        months_to_save = working_years * 12
+        with np.errstate(divide='ignore', invalid='ignore'):
+            payment_factor = np.where(monthly_return == 0, 1 / months_to_save,
+                                      monthly_return / ((1 + monthly_return) ** months_to_save - 1))
+        monthly_savings_needed = np.where(additional_needed <= 0, 0.0, additional_needed * payment_factor)
+        
+        shape = (len(incomes), len(ages), len(rates))
+        return {
+            'current_age': current_age,
+            'desired_incomes': incomes,
+            'retirement_ages': ages,
+            'expected_returns': rates,
+            'total_retirement_needed': np.broadcast_to(total_needed, shape),
+            'future_current_savings': np.broadcast_to(future_current_savings, shape),
+            'monthly_savings_needed': monthly_savings_needed,
+            'inflation_adjusted_income': np.broadcast_to(inflation_adjusted_income, shape)
+        }
+    
     def retirement_readiness_score(self, current_savings, target_savings, years_to_retirement):
         """Calculate retirement readiness score"""
         if years_to_retirement <= 0:
@@ -253,7 +470,142 @@ class FinancialTools:
         
         return round(score, 1)
     
+    # ===== MONTE CARLO SIMULATION =====
+    def _simulate_paths(self, initial_investment, monthly_contribution, years, expected_return, volatility,
+                        inflation, inflation_volatility, n_paths, chunk_size, time_budget, rng):
+        """Simulate random return and inflation paths in chunks.
+        
+        Returns the nominal portfolio value at each year end and the
+        cumulative inflation factor at each year end, as (paths x years)
+        arrays, plus whether the time budget cut the simulation short.
+        """
+        n_paths = n_paths or SimulationConfig.PATHS
+        chunk_size = chunk_size or SimulationConfig.CHUNK_SIZE
+        time_budget = SimulationConfig.TIME_BUDGET if time_budget is None else time_budget
+        months = years * 12
+        year_ends = np.arange(11, months, 12)
+        
+        values = np.empty((n_paths, years))
+        inflation_factors = np.empty((n_paths, years))
+        deadline = time.perf_counter() + time_budget
+        done = 0
+        
+        while done < n_paths:
+            n = min(chunk_size, n_paths - done)
+            
+            # One float32 (paths x months) buffer, transformed in place
+            buffer = rng.standard_normal((n, months), dtype=np.float32)
+            buffer *= volatility / np.sqrt(12)
+            buffer += expected_return / 12
+            np.maximum(buffer, -0.99, out=buffer)
+            
+            # With G_m the growth factor up to month m, the balance is
+            # V_m = G_m * (V_0 + C * sum(1 / G_j for j <= m))
+            np.log1p(buffer, out=buffer)
+            np.cumsum(buffer, axis=1, out=buffer)
+            growth = np.exp(buffer[:, year_ends].astype(float))
+            np.negative(buffer, out=buffer)
+            np.exp(buffer, out=buffer)
+            np.cumsum(buffer, axis=1, out=buffer)
+            deposits = buffer[:, year_ends].astype(float)
+            values[done:done + n] = growth * (initial_investment + monthly_contribution * deposits)
+            
+            annual_inflation = rng.normal(inflation, inflation_volatility, (n, years))
+            inflation_factors[done:done + n] = np.cumprod(1 + annual_inflation, axis=1)
+            
+            done += n
+            if time.perf_counter() > deadline:
+                break
+        
+        return values[:done], inflation_factors[:done], done < n_paths
+    
+    def _percentile_bands(self, values, percentiles):
+        """Percentiles of each year-end column, as a DataFrame indexed by year"""
+        bands = np.percentile(values, percentiles, axis=0)
+        return pd.DataFrame(
+            {f'p{p}': band for p, band in zip(percentiles, bands)},
+            index=pd.Index(np.arange(1, values.shape[1] + 1), name='year')
+        )
+    
+    def simulate_investment_growth(self, initial_investment, monthly_contribution, years, expected_return=0.07,
+                                   goal=None, volatility=None, inflation=None, n_paths=None, chunk_size=None,
+                                   time_budget=None, seed=None):
+        """Monte Carlo projection of investment growth under random returns and inflation.
+        
+        Returns percentile bands of the nominal and inflation-adjusted
+        portfolio value per year and, if a goal is given, the probability
+        that the final nominal value reaches it. Paths are simulated in
+        chunks; once time_budget seconds have passed the simulation stops
+        with the paths done so far ('truncated' is then True).
+        """
+        start = time.perf_counter()
+        values, inflation_factors, truncated = self._simulate_paths(
+            initial_investment, monthly_contribution, years, expected_return,
+            SimulationConfig.RETURN_VOLATILITY if volatility is None else volatility,
+            SimulationConfig.INFLATION if inflation is None else inflation,
+            SimulationConfig.INFLATION_VOLATILITY, n_paths, chunk_size, time_budget,
+            np.random.default_rng(seed)
+        )
+        final_values = values[:, -1]
+        
+        return {
+            'paths': len(values),
+            'truncated': truncated,
+            'percentiles': self._percentile_bands(values, SimulationConfig.PERCENTILES),
+            'real_percentiles': self._percentile_bands(values / inflation_factors, SimulationConfig.PERCENTILES),
+            'median_final_value': round(float(np.median(final_values)), 2),
+            'mean_final_value': round(float(final_values.mean()), 2),
+            'goal': goal,
+            'probability_of_goal': round(float((final_values >= goal).mean()), 4) if goal is not None else None,
+            'elapsed_seconds': round(time.perf_counter() - start, 4)
+        }
+    
+    def simulate_retirement(self, current_age, retirement_age, current_savings, desired_retirement_income,
+                            monthly_savings=None, life_expectancy=85, expected_return=0.07, volatility=None,
+                            inflation=None, n_paths=None, chunk_size=None, time_budget=None, seed=None):
+        """Monte Carlo check of a retirement plan under random returns and inflation.
+        
+        monthly_savings defaults to the amount calculate_retirement_needs
+        asks for. Each path's target is the fund needed for the desired
+        income inflated along that path's own inflation, so the probability
+        of meeting the goal reflects both sources of uncertainty.
+        """
+        plan = self.calculate_retirement_needs(
+            current_age, retirement_age, current_savings, desired_retirement_income, life_expectancy,
+            expected_return=expected_return
+        )
+        if monthly_savings is None:
+            monthly_savings = plan['monthly_savings_needed']
+        
+        start = time.perf_counter()
+        values, inflation_factors, truncated = self._simulate_paths(
+            current_savings, monthly_savings, plan['working_years'], expected_return,
+            SimulationConfig.RETURN_VOLATILITY if volatility is None else volatility,
+            SimulationConfig.INFLATION if inflation is None else inflation,
+            SimulationConfig.INFLATION_VOLATILITY, n_paths, chunk_size, time_budget,
+            np.random.default_rng(seed)
+        )
+        
+        # Same 4% rule as calculate_retirement_needs, per path
+        targets = desired_retirement_income * inflation_factors[:, -1] * plan['retirement_years'] / 0.04
+        funded = values[:, -1] / targets
+        
+        return {
+            'paths': len(values),
+            'truncated': truncated,
+            'monthly_savings': monthly_savings,
+            'percentiles': self._percentile_bands(values, SimulationConfig.PERCENTILES),
+            'median_target': round(float(np.median(targets)), 2),
+            'probability_of_goal': round(float((funded >= 1).mean()), 4),
+            'funded_ratio_percentiles': {
+                f'p{p}': round(float(ratio), 4)
+                for p, ratio in zip(SimulationConfig.PERCENTILES, np.percentile(funded, SimulationConfig.PERCENTILES))
+            },
+            'elapsed_seconds': round(time.perf_counter() - start, 4)
+        }
+    
     # ===== INSURANCE COST ANALYSIS =====
+    @memoized
     def calculate_insurance_costs(self, country, age, coverage_level='standard'):
         """Calculate estimated insurance costs"""
         if country not in self.insurance_data:
@@ -261,19 +613,9 @@ class FinancialTools:
         
         base_costs = self.insurance_data[country]
         
-        # Adjust for age
-        age_multiplier = 1.0
-        if age < 25:
-            age_multiplier = 1.5
-        elif age > 60:
-            age_multiplier = 1.8
-        
-        # Adjust for coverage level
-        coverage_multiplier = {
-            'basic': 0.7,
-            'standard': 1.0,
-            'premium': 1.5
-        }.get(coverage_level, 1.0)
+        # Adjust for age and coverage level
+        age_multiplier = self._insurance_age_multiplier(age)
+        coverage_multiplier = INSURANCE_COVERAGE_MULTIPLIERS.get(coverage_level, 1.0)
         
         adjusted_costs = {}
         for insurance_type, base_cost in base_costs.items():
@@ -290,26 +632,20 @@ class FinancialTools:
             'total_annual': round(total_monthly * 12, 2)
         }
     
+    def _insurance_age_multiplier(self, age):
+        """Insurance price adjustment for the policyholder's age"""
+        if age < 25:
+            return 1.5
+        if age > 60:
+            return 1.8
+        return 1.0
+    
     def _estimate_insurance_costs(self, age):
         """Estimate insurance costs for countries without specific data"""
-        base_health = 300
-        base_car = 100
-        base_renters = 15
-        base_life = 25
-        
-        # Age adjustments
-        if age < 25:
-            multiplier = 1.5
-        elif age > 60:
-            multiplier = 1.8
-        else:
-            multiplier = 1.0
-        
+        multiplier = self._insurance_age_multiplier(age)
         costs = {
-            'health': round(base_health * multiplier, 2),
-            'car': round(base_car * multiplier, 2),
-            'renters': round(base_renters * multiplier, 2),
-            'life': round(base_life * multiplier, 2)
+            insurance_type: round(base_cost * multiplier, 2)
+            for insurance_type, base_cost in ESTIMATED_INSURANCE_COSTS.items()
         }
         
         total_monthly = sum(costs.values())
@@ -324,6 +660,7 @@ class FinancialTools:
         }
     
     # ===== COST OF LIVING COMPARISONS =====
+    @memoized
     def compare_cost_of_living(self, current_city, target_city, current_salary):
         """Compare cost of living between cities"""
         if current_city not in self.cost_of_living_data or target_city not in self.cost_of_living_data:
@@ -363,7 +700,166 @@ class FinancialTools:
             return self.cost_of_living_data[city]
         return None
     
+    # ===== NET DISPOSABLE INCOME =====
+    def _insurance_monthly_totals(self, countries, age, coverage_level):
+        """Total monthly insurance cost in each country, as calculate_insurance_costs computes it"""
+        age_multiplier = self._insurance_age_multiplier(age)
+        coverage_multiplier = INSURANCE_COVERAGE_MULTIPLIERS.get(coverage_level, 1.0)
+        # Like _estimate_insurance_costs: standard coverage at international average prices
+        estimate = sum(ESTIMATED_INSURANCE_COSTS.values()) * age_multiplier
+        
+        return np.array([
+            self.insurance_monthly_totals[country] * age_multiplier * coverage_multiplier
+            if country in self.insurance_monthly_totals else estimate
+            for country in countries
+        ])
+    
+    @memoized
+    def net_disposable_income(self, salaries, cities=None, countries=None, age=35, coverage_level='standard'):
+        """Annual income left after tax, insurance and living costs, as a tidy DataFrame.
+        
+        By default each city is evaluated with its own country's tax and
+        insurance; pass countries to evaluate every city under every one of
+        them instead (e.g. when taxed in another country). Returns one row
+        per (country, city, salary) with annual figures and a monthly
+        disposable amount.
+        """
+        cities = list(cities if cities is not None else self.cities)
+        salaries = np.atleast_1d(np.asarray(salaries, dtype=float))
+        city_positions = [self.city_positions[city] for city in cities]
+        
+        if countries is None:
+            pairs = [(self.city_countries.get(city), position) for city, position in zip(cities, city_positions)]
+        else:
+            pairs = [(country, position) for country in countries for position in city_positions]
+        pair_countries = [country for country, _ in pairs]
+        
+        # Tax and insurance once per distinct country, then gathered per pair
+        distinct = list(dict.fromkeys(pair_countries))
+        country_rows = np.array([distinct.index(country) for country in pair_countries])
+        income_tax = self.income_tax_matrix(salaries, distinct)['total_tax'][country_rows]
+        insurance = 12 * self._insurance_monthly_totals(distinct, age, coverage_level)[country_rows]
+        living_costs = 12 * self.city_monthly_costs[[position for _, position in pairs]]
+        
+        net_income = salaries - income_tax
+        disposable = net_income - insurance[:, None] - living_costs[:, None]
+        n_salaries = len(salaries)
+        
+        return pd.DataFrame({
+            'country': np.repeat(pair_countries, n_salaries),
+            'city': np.repeat([self.cities[position] for _, position in pairs], n_salaries),
+            'salary': np.tile(salaries, len(pairs)),
+            'income_tax': income_tax.ravel(),
+            'net_income': net_income.ravel(),
+            'insurance': np.repeat(insurance, n_salaries),
+            'cost_of_living': np.repeat(living_costs, n_salaries),
+            'disposable_income': disposable.ravel(),
+            'disposable_monthly': disposable.ravel() / 12
+        })
+    
+    # ===== LOANS AND AMORTIZATION =====
+    def loan_payment(self, principal, annual_rate, term_months):
+        """Level monthly payment of a fully amortizing loan (vectorized over arrays)"""
+        principal = np.asarray(principal, dtype=float)
+        monthly_rate = np.asarray(annual_rate, dtype=float) / 12
+        term_months = np.asarray(term_months, dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(monthly_rate == 0, principal / term_months,
+                            principal * monthly_rate / (1 - (1 + monthly_rate) ** -term_months))
+    
+    def amortization_schedule(self, principals, annual_rates, term_months, extra_payments=0.0):
+        """Full monthly payment schedules for many loans at once.
+        
+        principals, annual_rates and term_months broadcast to one value per
+        loan. extra_payments is added to the scheduled payment: a scalar, one
+        monthly amount per loan, or a (loans x months) matrix of per-month
+        extras (e.g. lump sums). Balances are computed in closed form, so no
+        per-month loop runs; payments stop once a loan is paid off.
+        
+        Returns (loans x months) arrays of payment, interest, principal and
+        balance, plus per-loan scheduled payment, payoff month and totals.
+        """
+        principals, annual_rates, term_months = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(principals, dtype=float)),
+            np.atleast_1d(np.asarray(annual_rates, dtype=float)),
+            np.atleast_1d(np.asarray(term_months, dtype=int))
+        )
+        n_loans = len(principals)
+        horizon = int(term_months.max())
+        
+        scheduled = self.loan_payment(principals, annual_rates, term_months)
+        extra = np.asarray(extra_payments, dtype=float)
+        if extra.ndim == 1:
+            extra = extra[:, None]
+        payments = scheduled[:, None] + np.broadcast_to(extra, (n_loans, horizon))
+        
+        # B_k = (1 + r)^k * (P - sum(payment_j / (1 + r)^j, j <= k))
+        monthly_rate = annual_rates[:, None] / 12
+        growth = (1 + monthly_rate) ** np.arange(1, horizon + 1)
+        raw_balance = growth * (principals[:, None] - np.cumsum(payments / growth, axis=1))
+        
+        # The loan is paid off in the first month its balance reaches zero (within half a cent)
+        paid = raw_balance <= 0.005
+        paid_off = paid.any(axis=1)
+        payoff_index = np.where(paid_off, paid.argmax(axis=1), horizon - 1)
+        months = np.arange(horizon)
+        active = months[None, :] <= payoff_index[:, None]
+        
+        outstanding = (months[None, :] < payoff_index[:, None]) | ~paid_off[:, None]
+        balance = np.where(outstanding, np.maximum(raw_balance, 0), 0.0)
+        opening = np.concatenate([principals[:, None], balance[:, :-1]], axis=1)
+        interest = np.where(active, opening * monthly_rate, 0.0)
+        
+        # The last payment only clears what is left
+        payment = np.where(months[None, :] < payoff_index[:, None], payments, 0.0)
+        final = np.arange(n_loans), payoff_index
+        payment[final] = np.minimum(payments[final], opening[final] + interest[final])
+        
+        return {
+            'scheduled_payment': scheduled,
+            'payment': payment,
+            'interest': interest,
+            'principal': payment - interest,
+            'balance': balance,
+            'payoff_month': payoff_index + 1,
+            'total_interest': interest.sum(axis=1),
+            'total_paid': payment.sum(axis=1)
+        }
+    
+    @memoized
+    def amortization_table(self, principal, annual_rate, term_months, extra_payment=0.0):
+        """Month-by-month schedule of one loan as a DataFrame"""
+        schedule = self.amortization_schedule(principal, annual_rate, term_months, extra_payment)
+        months = int(schedule['payoff_month'][0])
+        return pd.DataFrame({
+            'month': np.arange(1, months + 1),
+            'payment': schedule['payment'][0, :months],
+            'interest': schedule['interest'][0, :months],
+            'principal': schedule['principal'][0, :months],
+            'balance': schedule['balance'][0, :months]
+        })
+    
+    @memoized
+    def compare_extra_payments(self, principal, annual_rate, term_months, extra_payments):
+        """Payoff time and interest for one loan under several extra monthly payments"""
+        extra_payments = np.asarray(extra_payments, dtype=float)
+        schedule = self.amortization_schedule(
+            np.full(len(extra_payments), principal), annual_rate, term_months, extra_payments
+        )
+        base = self.amortization_schedule(principal, annual_rate, term_months)
+        
+        return pd.DataFrame({
+            'extra_payment': extra_payments,
+            'monthly_payment': schedule['scheduled_payment'] + extra_payments,
+            'payoff_month': schedule['payoff_month'],
+            'months_saved': base['payoff_month'][0] - schedule['payoff_month'],
+            'total_interest': schedule['total_interest'],
+            'interest_saved': base['total_interest'][0] - schedule['total_interest'],
+            'total_paid': schedule['total_paid']
+        })
+    
     # ===== SAVINGS GOAL TRACKING =====
+    @memoized
     def calculate_savings_goal(self, goal_amount, current_savings, timeframe_months, monthly_contribution):
         """Calculate if savings goal is achievable"""
         # Simple calculation without interest for simplicity
@@ -406,6 +902,170 @@ class FinancialTools:
             'total_monthly_needed': total_monthly_needed,
             'feasibility': 'Achievable' if total_monthly_needed <= goals.get('available_monthly', float('inf')) else 'Adjust Goals'
         }
+    
+    def _water_fill(self, capacity, growth, needed):
+        """Smallest per-month cap whose contributions min(capacity, cap) grow to needed.
+        
+        Returns np.inf if even the full capacity falls short.
+        """
+        order = np.argsort(capacity)
+        caps = capacity[order]
+        weights = growth[order]
+        # Future value of contributing everything below each candidate cap, plus the cap elsewhere
+        below = np.concatenate([[0.0], np.cumsum(caps * weights)[:-1]])
+        above = np.cumsum(weights[::-1])[::-1]
+        k = np.searchsorted(below + caps * above, needed)
+        if k == len(caps):
+            return np.inf
+        return (needed - below[k]) / above[k]
+    
+    def _fill_goals(self, goal_order, needed, timeframes, monthly_budget, horizon, monthly_rate):
+        """Water-fill goals in the given order; returns contributions, leftover capacity and funded flags"""
+        months = np.arange(horizon)
+        capacity = np.full(horizon, float(monthly_budget))
+        contributions = np.zeros((len(needed), horizon))
+        funded = np.ones(len(needed), dtype=bool)
+        
+        for g in goal_order:
+            n = timeframes[g]
+            if needed[g] <= 0:
+                continue
+            
+            # A contribution at the end of month m grows until the deadline
+            growth = (1 + monthly_rate) ** (n - 1 - months[:n])
+            cap = self._water_fill(capacity[:n], growth, needed[g])
+            funded[g] = np.isfinite(cap)
+            contributions[g, :n] = np.minimum(capacity[:n], cap)
+            capacity[:n] -= contributions[g, :n]
+        
+        return contributions, capacity, funded
+    
+    @memoized
+    def optimize_savings_plan(self, goals, monthly_budget, annual_return=0.0):
+        """Allocate a monthly budget across savings goals, month by month.
+        
+        goals maps names to dicts with 'amount', 'timeframe_months' and
+        optional 'priority' ('high', 'medium' or 'low') and 'current_savings'.
+        Goals are admitted in priority order (then by deadline) while every
+        admitted goal can still be fully funded; admitted goals are funded
+        earliest deadline first, each as a level monthly amount capped by the
+        budget left in each month. Goals that cannot be fully funded then
+        share what is left, in priority order. Contributions earn
+        annual_return, compounded monthly.
+        
+        Returns the contribution schedule and goal balances as DataFrames
+        (one column per goal, one row per month), the budget left unallocated
+        each month, and per-goal plans.
+        """
+        names = list(goals)
+        amounts = np.array([goals[name]['amount'] for name in names], dtype=float)
+        timeframes = np.array([max(int(goals[name]['timeframe_months']), 1) for name in names])
+        current = np.array([goals[name].get('current_savings', 0) for name in names], dtype=float)
+        priorities = [goals[name].get('priority', 'medium') for name in names]
+        
+        horizon = int(timeframes.max()) if names else 0
+        monthly_rate = annual_return / 12
+        months = np.arange(horizon)
+        
+        # Amount still needed at each deadline after growing current savings
+        needed = amounts - current * (1 + monthly_rate) ** timeframes
+        
+        by_priority = sorted(range(len(names)), key=lambda g: (GOAL_PRIORITIES.get(priorities[g], 1), timeframes[g], g))
+        by_deadline = lambda selected: sorted(selected, key=lambda g: (timeframes[g], g))
+        
+        admitted = []
+        for g in by_priority:
+            trial = by_deadline(admitted + [g])
+            if self._fill_goals(trial, needed, timeframes, monthly_budget, horizon, monthly_rate)[2][trial].all():
+                admitted.append(g)
+        partial = [g for g in by_priority if g not in admitted]
+        
+        contributions, capacity, _ = self._fill_goals(
+            by_deadline(admitted) + partial, needed, timeframes, monthly_budget, horizon, monthly_rate
+        )
+        
+        # Balances in closed form: B_m = (1 + r)^m * (B_0 + sum(x_j / (1 + r)^j, j <= m))
+        growth = (1 + monthly_rate) ** np.arange(1, horizon + 1)
+        balances = growth * (current[:, None] + np.cumsum(contributions / growth, axis=1))
+        # A goal's savings are spent at its deadline
+        balances[months[None, :] >= timeframes[:, None]] = np.nan
+        
+        projected = balances[np.arange(len(names)), timeframes - 1] if names else np.zeros(0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            level_factor = np.where(monthly_rate == 0, 1 / timeframes,
+                                    monthly_rate / ((1 + monthly_rate) ** timeframes - 1))
+        monthly_needed = np.maximum(needed, 0) * level_factor
+        
+        goal_plans = {}
+        for g, name in enumerate(names):
+            achievable = bool(projected[g] >= amounts[g] - 0.01)
+            goal_plans[name] = {
+                'monthly_needed': round(float(monthly_needed[g]), 2),
+                'priority': priorities[g],
+                'timeframe': int(timeframes[g]),
+                'allocated_total': round(float(contributions[g].sum()), 2),
+                'average_monthly': round(float(contributions[g, :timeframes[g]].mean()), 2),
+                'projected_savings': round(float(projected[g]), 2),
+                'shortfall': round(max(0.0, float(amounts[g] - projected[g])), 2),
+                'achievable': achievable
+            }
+        
+        index = pd.Index(np.arange(1, horizon + 1), name='month')
+        return {
+            'schedule': pd.DataFrame(contributions.T, index=index, columns=names),
+            'balances': pd.DataFrame(balances.T, index=index, columns=names),
+            'unallocated': pd.Series(capacity, index=index, name='unallocated'),
+            'goal_plans': goal_plans,
+            'total_monthly_needed': round(float(monthly_needed.sum()), 2),
+            'feasibility': 'Achievable' if all(plan['achievable'] for plan in goal_plans.values()) else 'Adjust Goals'
+        }
+    
+    # ===== CURRENCY CONVERSION =====
+    def currency_rate_matrix(self):
+        """Cross rates between all supported currencies from one cached rate lookup.
+        
+        Entry [a, b] converts an amount in currency a to currency b. Fetch it
+        once per request and pass it to convert_results for every conversion.
+        """
+        rates_data = api_services.get_currency_rates(BASE_CURRENCY)
+        currencies = list(rates_data['rates'])
+        rates = np.array([rates_data['rates'][currency]['rate'] for currency in currencies], dtype=float)
+        return pd.DataFrame(rates[None, :] / rates[:, None], index=currencies, columns=currencies)
+    
+    def _convert(self, value, rate, field=None):
+        if field in NON_MONETARY_FIELDS or isinstance(value, (bool, str, type(None))):
+            return value
+        if isinstance(value, dict):
+            return {key: self._convert(item, rate, key) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._convert(item, rate, field) for item in value]
+        if isinstance(value, pd.DataFrame):
+            # Every monetary column in one array multiply
+            columns = [column for column in value.columns
+                       if column not in NON_MONETARY_FIELDS and pd.api.types.is_numeric_dtype(value[column])
+                       and not pd.api.types.is_bool_dtype(value[column])]
+            converted = value.copy()
+            if columns:
+                converted[columns] = value[columns].to_numpy(dtype=float) * rate
+            return converted
+        if isinstance(value, (pd.Series, np.ndarray)) and not np.issubdtype(value.dtype, np.number):
+            return value
+        if isinstance(value, (int, float, np.number, pd.Series, np.ndarray)):
+            return value * rate
+        return value
+    
+    def convert_results(self, result, currency, from_currency=BASE_CURRENCY, rates=None):
+        """A calculator result with its amounts of money expressed in another currency.
+        
+        Numbers, arrays, Series and DataFrame columns are scaled by a single
+        exchange rate, while rates, ages, periods and counts are left as they
+        are. Pass rates from currency_rate_matrix to reuse one lookup.
+        """
+        if currency == from_currency:
+            return result
+        if rates is None:
+            rates = self.currency_rate_matrix()
+        return self._convert(result, float(rates.loc[from_currency, currency]))
 
 # Global instance
 financial_tools = FinancialTools()
\ No newline at end of file
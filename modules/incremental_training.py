@@ -0,0 +1,107 @@
+# modules/incremental_training.py
+import os
+import pandas as pd
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from modules import dataset_store
+from modules.preprocessing import FeaturePipeline
+
+# Out-of-core training for the recommendation engines.
+#
+# The dataset (a CSV file or a columnar store directory) is streamed twice in
+# fixed-size chunks: the first pass collects the category vocabularies and
+# builds the feature pipeline, the second pass fits one small forest per chunk.
+# model_factory is called with the number of chunks and the chunk index, so
+# callers can split a fixed tree budget across the chunks; it returns None to
+# skip a chunk. The chunk forests are bagged into a single classifier that
+# averages their class probabilities, weighted by chunk size.
+#
+# Peak memory is one chunk plus the fitted chunk models, so it does not grow
+# with the number of rows read. Throughput targets, end to end (both passes)
+# on one core with the default chunk size and the engines' profile-sized chunk
+# models: at least 250k rows/sec for 'fast', 100k for 'balanced' and 50k for
+# 'accurate', so a 10M row dataset trains in under two minutes on 'balanced'.
+
+DEFAULT_CHUNKSIZE = 200_000
+
+
+def default_chunk_model(n_chunks=None, index=None):
+    """Model fitted on each chunk, the same size whatever the number of chunks"""
+    return RandomForestClassifier(n_estimators=10, max_depth=12, random_state=42, n_jobs=-1)
+
+
+class ChunkedEnsembleClassifier:
+    """Averages the class probabilities of models fitted on separate data chunks"""
+
+    def __init__(self, n_classes):
+        self.classes_ = np.arange(n_classes)
+        self.estimators_ = []
+        self.weights_ = []
+
+    def add_estimator(self, model, weight):
+        """Add a fitted chunk model, weighted by the rows it was trained on"""
+        self.estimators_.append(model)
+        self.weights_.append(weight)
+
+    def predict_proba(self, X):
+        probabilities = np.zeros((len(X), len(self.classes_)))
+
+        for model, weight in zip(self.estimators_, self.weights_):
+            # A chunk may not contain every class, so map its columns back
+            probabilities[:, model.classes_] += weight * model.predict_proba(X)
+
+        return probabilities / sum(self.weights_)
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+class ChunkedTrainer:
+    """Trains a classifier on a dataset too large to hold in memory"""
+
+    def __init__(self, numeric_features, categorical_features, target,
+                 chunksize=DEFAULT_CHUNKSIZE, model_factory=default_chunk_model):
+        self.numeric_features = list(numeric_features)
+        self.categorical_features = list(categorical_features)
+        self.target = target
+        self.chunksize = chunksize
+        self.model_factory = model_factory
+
+    def _read_chunks(self, source, columns):
+        if os.path.isdir(source):
+            return dataset_store.iter_chunks(source, self.chunksize, columns)
+        return pd.read_csv(source, usecols=columns, chunksize=self.chunksize)
+
+    def build_pipeline(self, source):
+        """First pass: collect category vocabularies into a fitted feature pipeline"""
+        columns = self.categorical_features + [self.target]
+        vocabularies = {col: set() for col in columns}
+        self.n_chunks_ = 0
+
+        for chunk in self._read_chunks(source, columns):
+            self.n_chunks_ += 1
+            for col in columns:
+                vocabularies[col].update(chunk[col].unique())
+
+        return FeaturePipeline.from_categories(
+            self.numeric_features, self.categorical_features, self.target, vocabularies
+        )
+
+    def fit(self, source):
+        """Train the chunk ensemble, returning (model, pipeline)"""
+        pipeline = self.build_pipeline(source)
+        model = ChunkedEnsembleClassifier(len(pipeline.labels))
+
+        # Second pass: fit one model per chunk, skipping chunks the factory gives no model
+        chunks = self._read_chunks(source, pipeline.feature_columns + [self.target])
+        for index, chunk in enumerate(chunks):
+            chunk_model = self.model_factory(self.n_chunks_, index)
+            if chunk_model is None:
+                continue
+
+            X = pipeline.transform(chunk)
+            y = pipeline.transform_target(chunk)
+            chunk_model.fit(X, y)
+            model.add_estimator(chunk_model, len(chunk))
+
+        return model, pipeline
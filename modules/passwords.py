@@ -0,0 +1,123 @@
+# modules/passwords.py
+import base64
+import hashlib
+import hmac
+import os
+
+from utils.config import AuthConfig
+
+# Salted password hashing for Authentication.
+#
+# Hashes are stored as self-describing strings, '$'-separated:
+#
+#     pbkdf2_sha256$<iterations>$<salt>$<hash>
+#     scrypt$<n>$<r>$<p>$<salt>$<hash>
+#
+# with base64 salt and hash, so the algorithm and work factor of every stored
+# hash are known when it is checked. Accounts created before salting hold a
+# bare hex SHA-256 digest; those still verify, and needs_rehash reports them,
+# like any hash made with settings other than the current profile's.
+
+SALT_BYTES = 16
+
+
+def _b64encode(data):
+    return base64.b64encode(data).decode('ascii')
+
+
+def _b64decode(text):
+    return base64.b64decode(text.encode('ascii'))
+
+
+class PBKDF2Hasher:
+    """PBKDF2-HMAC-SHA256 with a tunable iteration count"""
+
+    algorithm = 'pbkdf2_sha256'
+
+    def __init__(self, iterations=600_000):
+        self.iterations = iterations
+
+    def _derive(self, password, salt, iterations):
+        return hashlib.pbkdf2_hmac('sha256', password.encode(), salt, iterations)
+
+    def hash(self, password):
+        salt = os.urandom(SALT_BYTES)
+        digest = self._derive(password, salt, self.iterations)
+        return f"{self.algorithm}${self.iterations}${_b64encode(salt)}${_b64encode(digest)}"
+
+    def verify(self, password, encoded):
+        _, iterations, salt, digest = encoded.split('$')
+        return hmac.compare_digest(self._derive(password, _b64decode(salt), int(iterations)), _b64decode(digest))
+
+    def is_current(self, encoded):
+        return encoded.split('$')[:2] == [self.algorithm, str(self.iterations)]
+
+
+class ScryptHasher:
+    """scrypt with tunable CPU/memory cost (n), block size (r) and parallelism (p)"""
+
+    algorithm = 'scrypt'
+
+    def __init__(self, n=2 ** 14, r=8, p=1):
+        self.n = n
+        self.r = r
+        self.p = p
+
+    @staticmethod
+    def _derive(password, salt, n, r, p):
+        # scrypt needs 128 * n * r bytes; allow it explicitly for larger n
+        return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p,
+                              maxmem=256 * n * r + 1024 * 1024, dklen=32)
+
+    def hash(self, password):
+        salt = os.urandom(SALT_BYTES)
+        digest = self._derive(password, salt, self.n, self.r, self.p)
+        return f"{self.algorithm}${self.n}${self.r}${self.p}${_b64encode(salt)}${_b64encode(digest)}"
+
+    def verify(self, password, encoded):
+        _, n, r, p, salt, digest = encoded.split('$')
+        derived = self._derive(password, _b64decode(salt), int(n), int(r), int(p))
+        return hmac.compare_digest(derived, _b64decode(digest))
+
+    def is_current(self, encoded):
+        return encoded.split('$')[:4] == [self.algorithm, str(self.n), str(self.r), str(self.p)]
+
+
+HASHERS = {
+    PBKDF2Hasher.algorithm: PBKDF2Hasher,
+    ScryptHasher.algorithm: ScryptHasher
+}
+
+
+def get_hasher(profile=None):
+    """Build the hasher of an AuthConfig profile (default: AuthConfig.DEFAULT_PROFILE)"""
+    profile = profile or AuthConfig.DEFAULT_PROFILE
+    if profile not in AuthConfig.PROFILES:
+        raise ValueError(f"Unknown password hash profile '{profile}'. "
+                         f"Choose from: {', '.join(AuthConfig.PROFILES)}")
+
+    settings = dict(AuthConfig.PROFILES[profile])
+    return HASHERS[settings.pop('algorithm')](**settings)
+
+
+def is_legacy_hash(encoded):
+    """Whether encoded is an unsalted hex SHA-256 digest"""
+    return '$' not in encoded
+
+
+def verify_password(password, encoded):
+    """Check a password against a stored hash of any supported format"""
+    if not encoded:
+        return False
+    if is_legacy_hash(encoded):
+        return hmac.compare_digest(hashlib.sha256(password.encode()).hexdigest(), encoded)
+
+    algorithm = encoded.split('$', 1)[0]
+    if algorithm not in HASHERS:
+        return False
+    return HASHERS[algorithm]().verify(password, encoded)
+
+
+def needs_rehash(encoded, hasher):
+    """Whether a stored hash should be replaced by one from hasher"""
+    return is_legacy_hash(encoded) or not hasher.is_current(encoded)
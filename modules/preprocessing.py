@@ -0,0 +1,76 @@
+# modules/preprocessing.py
+import numpy as np
+import pandas as pd
+
+class FeaturePipeline:
+    """Encodes engine features into one float32 matrix, the dtype the tree models use internally.
+
+    Categorical columns become their integer position in a fixed category
+    index; values never seen at fit time fall back to code 0. The same fitted
+    pipeline is saved with the model and used for training and inference, and
+    the input data is never modified.
+    """
+
+    def __init__(self, numeric_features, categorical_features, target):
+        self.numeric_features = list(numeric_features)
+        self.categorical_features = list(categorical_features)
+        self.target = target
+        self.categories = {}
+
+    @classmethod
+    def from_categories(cls, numeric_features, categorical_features, target, categories):
+        """Build a fitted pipeline from known category values per column"""
+        pipeline = cls(numeric_features, categorical_features, target)
+        pipeline.categories = {col: pd.Index(sorted(values)) for col, values in categories.items()}
+        return pipeline
+
+    @property
+    def feature_columns(self):
+        return self.numeric_features + self.categorical_features
+
+    @property
+    def labels(self):
+        """Target values, in the order of the model's class columns"""
+        return self.categories[self.target].to_numpy()
+
+    def fit(self, data):
+        """Learn the categories of every categorical column and the target"""
+        self.categories = {
+            col: pd.Index(sorted(data[col].unique())) for col in self.categorical_features + [self.target]
+        }
+        return self
+
+    def _encode(self, col, values):
+        codes = self.categories[col].get_indexer(values)
+        codes[codes < 0] = 0  # Unseen value
+        return codes
+
+    def transform(self, data):
+        """Encode a DataFrame (or dict of columns) into the feature matrix"""
+        n_rows = len(data[self.feature_columns[0]])
+        X = np.empty((n_rows, len(self.feature_columns)), dtype=np.float32)
+
+        for i, col in enumerate(self.numeric_features):
+            X[:, i] = data[col]
+
+        offset = len(self.numeric_features)
+        for i, col in enumerate(self.categorical_features):
+            X[:, offset + i] = self._encode(col, data[col])
+
+        return X
+
+    def transform_target(self, data):
+        """Encode the target column into class codes"""
+        return self.categories[self.target].get_indexer(data[self.target])
+
+    def fit_transform(self, data):
+        """Fit on a DataFrame and return (X, y)"""
+        self.fit(data)
+        return self.transform(data), self.transform_target(data)
+
+    def transform_records(self, records):
+        """Encode a list of user input dicts into the feature matrix"""
+        columns = {col: [record.get(col) for record in records] for col in self.feature_columns}
+        for col in self.numeric_features:
+            columns[col] = np.array(columns[col], dtype=np.float32)
+        return self.transform(columns)
@@ -0,0 +1,51 @@
+# modules/ranking.py
+import numpy as np
+
+def top_k_indices(probabilities, k):
+    """Indices of the k highest probabilities, best first, along the last axis"""
+    probabilities = np.asarray(probabilities)
+    n_labels = probabilities.shape[-1]
+    k = min(k, n_labels)
+
+    # Partition so only the k selected entries need sorting
+    if k < n_labels:
+        candidates = np.argpartition(-probabilities, k - 1, axis=-1)[..., :k]
+    else:
+        candidates = np.broadcast_to(np.arange(n_labels), probabilities.shape)
+
+    top = np.take_along_axis(probabilities, candidates, axis=-1)
+    order = np.argsort(-top, axis=-1, kind='stable')
+    return np.take_along_axis(candidates, order, axis=-1)
+
+
+def top_k_hit_rate(probabilities, classes, y_true, k):
+    """Share of rows whose true label is among the k most probable"""
+    top_labels = np.asarray(classes)[top_k_indices(probabilities, k)]
+    return float(np.mean(np.any(top_labels == np.asarray(y_true)[:, None], axis=1)))
+
+
+class RankedRecommendations:
+    """Top-k recommendations, with the full ranked distribution built on demand"""
+
+    def __init__(self, labels, probabilities, k):
+        self.labels = labels
+        self.probabilities = probabilities
+        self.k = k
+        self.top = [(labels[i], probabilities[i]) for i in top_k_indices(probabilities, k)]
+        self._distribution = None
+
+    @property
+    def top_recommendation(self):
+        return self.top[0][0]
+
+    @property
+    def top_probability(self):
+        return self.top[0][1]
+
+    @property
+    def distribution(self):
+        """All (label, probability) pairs, highest probability first"""
+        if self._distribution is None:
+            order = np.argsort(-self.probabilities, kind='stable')
+            self._distribution = [(self.labels[i], self.probabilities[i]) for i in order]
+        return self._distribution
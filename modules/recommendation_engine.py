@@ -0,0 +1,158 @@
+# modules/recommendation_engine.py
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+import joblib
+import os
+from utils.config import ModelConfig
+from modules.preprocessing import FeaturePipeline
+from modules.ranking import RankedRecommendations, top_k_indices, top_k_hit_rate
+
+class RecommendationEngine:
+    """Model lifecycle shared by the student, tourist and professional engines"""
+
+    # Defined by each engine
+    model_name = None
+    dataset = None
+    numeric_features = []
+    categorical_features = []
+    target = None
+    probabilities_key = None
+
+    def __init__(self, profile=None):
+        self.profile = profile or ModelConfig.DEFAULT_PROFILE
+        if self.profile not in ModelConfig.PROFILES:
+            raise ValueError(f"Unknown model profile '{self.profile}', expected one of {list(ModelConfig.PROFILES)}")
+
+        self.model = None
+        self.pipeline = None
+        self.evaluation = None
+        self.load_or_train_model()
+
+    @property
+    def model_path(self):
+        """Saved model location; each profile keeps its own artifact"""
+        return os.path.join("models", f"{self.model_name}_model_{self.profile}.pkl")
+
+    def build_model(self):
+        """Create an untrained classifier sized by the model profile"""
+        return RandomForestClassifier(random_state=42, **ModelConfig.PROFILES[self.profile])
+
+    def build_chunk_model(self, n_chunks, index):
+        """Create the classifier for chunk index of n_chunks in incremental training.
+
+        Uses the profile's tree settings with its trees split across the
+        chunks, so the ensemble has exactly the profile's number of trees.
+        With more chunks than trees, the trees go to evenly spaced chunks
+        and None is returned for the rest.
+        """
+        settings = dict(ModelConfig.PROFILES[self.profile])
+        total = settings['n_estimators']
+        settings['n_estimators'] = (index + 1) * total // n_chunks - index * total // n_chunks
+        if not settings['n_estimators']:
+            return None
+        return RandomForestClassifier(random_state=42, n_jobs=-1, **settings)
+
+    def load_or_train_model(self):
+        """Load existing model or train a new one"""
+        if os.path.exists(self.model_path):
+            self.model, self.pipeline = joblib.load(self.model_path)
+        else:
+            self.train_model()
+
+    def train_model(self, save=True):
+        """Train the recommendation model in memory and score it on the held-out split"""
+        # Load or generate sample data
+        from modules.data_loader import DataLoader
+        data_loader = DataLoader()
+        data = data_loader.load_data(self.dataset)
+
+        # Preprocess data
+        X, y, pipeline = self.preprocess_data(data)
+
+        # Train model
+        from sklearn.model_selection import train_test_split
+        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+
+        self.model = self.build_model()
+        self.model.fit(X_train, y_train)
+
+        self.pipeline = pipeline
+        self.evaluation = self.evaluate_model(X_test, y_test)
+
+        if save:
+            self.save_model()
+
+    def evaluate_model(self, X, y, k=3):
+        """Score the model on labelled data"""
+        probabilities = self.model.predict_proba(X)
+        y = np.asarray(y)
+        predicted = self.model.classes_[np.argmax(probabilities, axis=1)]
+
+        return {
+            'accuracy': float(np.mean(predicted == y)),
+            'top_k_hit_rate': top_k_hit_rate(probabilities, self.model.classes_, y, k),
+            'k': k,
+            'rows': len(y)
+        }
+
+    def train_model_incremental(self, source=None, chunksize=None):
+        """Train on a dataset too large for memory by streaming it in chunks, sized by the model profile"""
+        from modules.data_loader import DataLoader
+        from modules.incremental_training import ChunkedTrainer, DEFAULT_CHUNKSIZE
+
+        if source is None:
+            data_loader = DataLoader()
+            source = data_loader.get_store_path(self.dataset)
+            if not os.path.isdir(source):
+                data_loader.load_data(self.dataset)
+
+        trainer = ChunkedTrainer(
+            self.numeric_features, self.categorical_features, self.target,
+            chunksize=chunksize or DEFAULT_CHUNKSIZE, model_factory=self.build_chunk_model
+        )
+        self.model, self.pipeline = trainer.fit(source)
+        self.save_model()
+
+    def save_model(self):
+        """Persist the model and its feature pipeline"""
+        os.makedirs(os.path.dirname(self.model_path), exist_ok=True)
+        joblib.dump((self.model, self.pipeline), self.model_path)
+
+    def preprocess_data(self, data):
+        """Encode data for model training without modifying it"""
+        pipeline = FeaturePipeline(self.numeric_features, self.categorical_features, self.target)
+        X, y = pipeline.fit_transform(data)
+        return X, y, pipeline
+
+    def get_recommendations(self, user_input):
+        """Get recommendations based on user input"""
+        ranked = self.get_top_recommendations(user_input, k=1)
+        top_label, top_prob = ranked.top[0]
+
+        return {
+            'top_recommendation': top_label,
+            'top_probability': top_prob,
+            self.probabilities_key: ranked.distribution,
+            'confidence': top_prob
+        }
+
+    def get_top_recommendations(self, user_input, k=3):
+        """Get the k best recommendations without ranking every label"""
+        probabilities = self.model.predict_proba(self.prepare_features(user_input))[0]
+        return RankedRecommendations(self.pipeline.labels, probabilities, k)
+
+    def predict_proba_batch(self, user_inputs):
+        """Get the probability matrix for many user inputs in one model call"""
+        return self.model.predict_proba(self.pipeline.transform_records(user_inputs))
+
+    def get_recommendations_batch(self, user_inputs, k=3):
+        """Get the k best labels and their probabilities for each user input"""
+        probabilities = self.predict_proba_batch(user_inputs)
+        indices = top_k_indices(probabilities, k)
+
+        labels = self.pipeline.labels[indices]
+        return labels, np.take_along_axis(probabilities, indices, axis=1)
+
+    def prepare_features(self, user_input):
+        """Prepare user input for model prediction as a one-row feature matrix"""
+        return self.pipeline.transform_records([user_input])
@@ -0,0 +1,171 @@
+# modules/reference_data.py
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+
+# Financial reference tables for FinancialTools.
+#
+# Tax brackets, cost of living and insurance prices live in versioned JSON
+# files under data/reference, so coverage grows by editing data rather than
+# code. Each file carries a 'version' that is bumped whenever its figures
+# change. Files are validated on load and compiled once per process into
+# indexed structures: a TaxSchedule per country, and per-city arrays. The
+# loaded tables are shared by every FinancialTools instance and must be
+# treated as read-only; editing a file reloads it on the next lookup.
+
+REFERENCE_DIR = "data/reference"
+TABLE_FILES = {
+    'tax_brackets': "tax_brackets.json",
+    'cost_of_living': "cost_of_living.json",
+    'insurance': "insurance.json"
+}
+
+COST_OF_LIVING_FIELDS = ('rent_1bed', 'utilities', 'groceries', 'transport', 'total')
+INSURANCE_FIELDS = ('health', 'car', 'renters', 'life')
+
+
+class TaxSchedule:
+    """A country's tax brackets compiled to threshold, rate and cumulative-tax arrays"""
+
+    def __init__(self, brackets):
+        # Bracket i taxes income from thresholds[i] up to thresholds[i + 1]
+        self.thresholds = np.array([bracket['min'] for bracket in brackets], dtype=float)
+        self.rates = np.array([bracket['rate'] for bracket in brackets], dtype=float)
+        # Tax owed on all income below each threshold
+        self.base_tax = np.concatenate([[0.0], np.cumsum(np.diff(self.thresholds) * self.rates[:-1])])
+
+    def tax(self, incomes):
+        """Tax owed on each of an array of incomes"""
+        incomes = np.maximum(np.asarray(incomes, dtype=float), 0)
+        bracket = np.searchsorted(self.thresholds, incomes, side='right') - 1
+        return self.base_tax[bracket] + (incomes - self.thresholds[bracket]) * self.rates[bracket]
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _check(condition, table, message):
+    if not condition:
+        raise ValueError(f"Invalid reference table '{table}': {message}")
+
+
+def validate_tax_brackets(countries):
+    """Check that every country's brackets are contiguous, ordered and open-ended"""
+    for country, brackets in countries.items():
+        _check(isinstance(brackets, list) and brackets, 'tax_brackets', f"{country} has no brackets")
+        _check(brackets[0].get('min') == 0, 'tax_brackets', f"{country}'s first bracket must start at 0")
+
+        for i, bracket in enumerate(brackets):
+            _check(_is_number(bracket.get('min')) and _is_number(bracket.get('rate')), 'tax_brackets',
+                   f"{country} bracket {i} needs numeric min and rate")
+            _check(0 <= bracket['rate'] <= 1, 'tax_brackets', f"{country} bracket {i} rate must be between 0 and 1")
+
+            last = i == len(brackets) - 1
+            if last:
+                _check(bracket.get('max') is None, 'tax_brackets', f"{country}'s top bracket must have max null")
+            else:
+                _check(_is_number(bracket.get('max')) and bracket['max'] >= bracket['min'], 'tax_brackets',
+                       f"{country} bracket {i} needs a max of at least its min")
+                # Brackets are inclusive, so each starts one above the previous max
+                _check(brackets[i + 1].get('min') == bracket['max'] + 1, 'tax_brackets',
+                       f"{country} bracket {i + 1} must start at {bracket['max'] + 1}")
+
+
+def validate_cost_of_living(cities):
+    """Check that every city has a country and non-negative monthly costs"""
+    for city, costs in cities.items():
+        _check(isinstance(costs.get('country'), str) and costs['country'], 'cost_of_living',
+               f"{city} has no country")
+        for field in COST_OF_LIVING_FIELDS:
+            _check(_is_number(costs.get(field)) and costs[field] >= 0, 'cost_of_living',
+                   f"{city} needs a non-negative '{field}'")
+
+
+def validate_insurance(countries):
+    """Check that every country has non-negative monthly premiums"""
+    for country, costs in countries.items():
+        for field in INSURANCE_FIELDS:
+            _check(_is_number(costs.get(field)) and costs[field] >= 0, 'insurance',
+                   f"{country} needs a non-negative '{field}'")
+        _check(set(costs) == set(INSURANCE_FIELDS), 'insurance',
+               f"{country} has unknown fields {sorted(set(costs) - set(INSURANCE_FIELDS))}")
+
+
+class ReferenceData:
+    """Validated reference tables with their indexed, array-backed forms"""
+
+    def __init__(self, tables, versions, digest):
+        self.versions = versions
+        # Changes whenever any table's contents change
+        self.digest = digest
+
+        # Tables in the dict shapes FinancialTools has always exposed
+        self.tax_brackets = {
+            country: [{**bracket, 'max': float('inf') if bracket['max'] is None else bracket['max']}
+                      for bracket in brackets]
+            for country, brackets in tables['tax_brackets']['countries'].items()
+        }
+        self.cost_of_living = {
+            city: {field: costs[field] for field in COST_OF_LIVING_FIELDS}
+            for city, costs in tables['cost_of_living']['cities'].items()
+        }
+        self.insurance = tables['insurance']['countries']
+
+        self.tax_schedules = {country: TaxSchedule(brackets) for country, brackets in self.tax_brackets.items()}
+
+        self.cities = list(self.cost_of_living)
+        self.city_positions = {city: i for i, city in enumerate(self.cities)}
+        self.city_countries = {city: costs['country'] for city, costs in tables['cost_of_living']['cities'].items()}
+        self.city_monthly_costs = np.array([self.cost_of_living[city]['total'] for city in self.cities], dtype=float)
+        self.insurance_monthly_totals = {country: float(sum(costs.values())) for country, costs in self.insurance.items()}
+
+
+VALIDATORS = {
+    'tax_brackets': lambda table: validate_tax_brackets(table['countries']),
+    'cost_of_living': lambda table: validate_cost_of_living(table['cities']),
+    'insurance': lambda table: validate_insurance(table['countries'])
+}
+
+
+def read_reference_data(path=REFERENCE_DIR):
+    """Read, validate and index the reference tables in a directory"""
+    tables = {}
+    versions = {}
+    digest = hashlib.sha1()
+
+    for name, filename in TABLE_FILES.items():
+        with open(os.path.join(path, filename), 'rb') as f:
+            content = f.read()
+        digest.update(content)
+
+        table = json.loads(content)
+        _check(isinstance(table.get('version'), int) and table['version'] > 0, name, "needs a positive integer version")
+        VALIDATORS[name](table)
+        tables[name] = table
+        versions[name] = table['version']
+
+    return ReferenceData(tables, versions, digest.hexdigest()[:12])
+
+
+_loaded = {}
+_loaded_lock = threading.Lock()
+
+
+def _stamp(path):
+    stats = [os.stat(os.path.join(path, filename)) for filename in TABLE_FILES.values()]
+    return tuple((stat.st_mtime_ns, stat.st_size) for stat in stats)
+
+
+def load_reference_data(path=REFERENCE_DIR):
+    """Return the process-wide ReferenceData for path, re-reading it only when a file changes"""
+    key = os.path.abspath(path)
+    stamp = _stamp(path)
+    with _loaded_lock:
+        cached = _loaded.get(key)
+        if cached is None or cached[0] != stamp:
+            cached = _loaded[key] = (stamp, read_reference_data(path))
+        return cached[1]
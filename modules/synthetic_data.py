@@ -0,0 +1,153 @@
+# modules/synthetic_data.py
+import numpy as np
+
+# Synthetic profile generators for the DataLoader datasets.
+#
+# Each generator draws one chunk of rows from a numpy Generator and returns the
+# columns already encoded for the dataset store (category codes for
+# categorical columns), so datasets of any size can be streamed to disk chunk
+# by chunk. Features are correlated rather than independent: budgets and
+# salaries depend on degree, experience and industry, and the target country
+# is sampled from a softmax over affinities to the user's profile.
+
+def _affinity(schema, col, target, pairs):
+    """Matrix of (column category x target category) weights from (value, target, weight) triples"""
+    matrix = np.zeros((len(schema[col]), len(schema[target])))
+    for value, target_value, weight in pairs:
+        matrix[schema[col].index(value), schema[target].index(target_value)] = weight
+    return matrix
+
+
+def _choice(rng, n, probabilities):
+    """Draw n category codes with the given probabilities"""
+    return rng.choice(len(probabilities), size=n, p=np.asarray(probabilities) / np.sum(probabilities)).astype(np.int8)
+
+
+def _sample_target(rng, logits):
+    """Sample one category per row from a softmax over logits (Gumbel-max trick)"""
+    return np.argmax(logits + rng.gumbel(size=logits.shape), axis=1).astype(np.int8)
+
+
+def student_chunk(rng, n, schema):
+    """Generate n correlated student profiles"""
+    degree_level = _choice(rng, n, [0.45, 0.35, 0.1, 0.1])
+    preferred_major = _choice(rng, n, [0.22, 0.18, 0.17, 0.08, 0.12, 0.08, 0.15])
+    language_preference = _choice(rng, n, [0.55, 0.1, 0.1, 0.08, 0.07, 0.06, 0.04])
+
+    academic_score = np.clip(rng.normal(78, 9, n), 60, 99).round()
+    # Graduate applicants tend to have higher scores
+    academic_score = np.clip(academic_score + 3 * (degree_level == 1) + 6 * (degree_level == 2), 60, 99)
+
+    degree_budget = np.array([25000, 32000, 20000, 15000])[degree_level]
+    budget = np.clip(degree_budget * rng.lognormal(0, 0.3, n), 10000, 49999).round()
+
+    # Language and budget drive the destination
+    language_affinity = _affinity(schema, 'language_preference', 'country', [
+        ('English', 'USA', 1.0), ('English', 'UK', 1.0), ('English', 'Canada', 0.8), ('English', 'Australia', 0.8),
+        ('French', 'France', 2.0), ('French', 'Canada', 1.0), ('German', 'Germany', 2.0),
+        ('German', 'Netherlands', 0.5), ('Japanese', 'Japan', 2.5), ('Spanish', 'USA', 0.5),
+        ('Chinese', 'Australia', 0.8), ('Korean', 'Japan', 0.8), ('English', 'Sweden', 0.3)
+    ])
+    country_cost = np.array([1.5, 1.0, 0.6, 0.7, -0.8, -0.5, 0.0, -0.2, -0.6])
+    budget_z = (budget - 25000) / 10000
+    logits = language_affinity[language_preference] + np.outer(budget_z, country_cost) * 0.8
+    logits += np.outer((academic_score - 78) / 9, np.array([0.5, 0.5, 0.1, 0.1, 0.2, 0.1, 0.2, 0.1, 0.1]))
+
+    return {
+        'academic_score': academic_score.astype(np.int16),
+        'budget': budget.astype(np.int32),
+        'preferred_major': preferred_major,
+        'language_preference': language_preference,
+        'degree_level': degree_level,
+        'country': _sample_target(rng, logits)
+    }
+
+
+def tourist_chunk(rng, n, schema):
+    """Generate n correlated tourist profiles"""
+    travel_style = _choice(rng, n, [0.15, 0.2, 0.15, 0.12, 0.1, 0.15, 0.13])
+    travel_companions = _choice(rng, n, [0.2, 0.3, 0.25, 0.2, 0.05])
+    season = _choice(rng, n, [0.2, 0.35, 0.15, 0.1, 0.2])
+
+    # Beach and relaxation trips lean to warm climates, adventure to mountains
+    style_climate = _affinity(schema, 'travel_style', 'climate_preference', [
+        ('Beach', 'Tropical', 2.0), ('Beach', 'Mediterranean', 1.5), ('Relaxation', 'Tropical', 1.0),
+        ('Relaxation', 'Mediterranean', 1.0), ('Adventure', 'Mountain', 1.5), ('Adventure', 'Desert', 0.8),
+        ('Cultural', 'Temperate', 1.0), ('Historical', 'Mediterranean', 1.0), ('City Break', 'Temperate', 1.2),
+        ('Food', 'Mediterranean', 0.8)
+    ])
+    climate_preference = _sample_target(rng, style_climate[travel_style])
+
+    duration = np.clip(rng.gamma(3.0, 3.5, n).round() + 3, 3, 29)
+    # Budget scales with trip length and group size
+    daily_cost = np.array([110, 190, 300, 260, 230])[travel_companions]
+    budget = np.clip(daily_cost * duration * rng.lognormal(0, 0.35, n), 1000, 9999).round()
+
+    climate_destination = _affinity(schema, 'climate_preference', 'destination', [
+        ('Tropical', 'Thailand', 2.0), ('Tropical', 'Brazil', 1.5), ('Mediterranean', 'Italy', 1.5),
+        ('Mediterranean', 'Spain', 1.5), ('Mediterranean', 'Greece', 1.5), ('Temperate', 'France', 1.0),
+        ('Temperate', 'Japan', 1.0), ('Temperate', 'USA', 0.8), ('Desert', 'USA', 1.0), ('Desert', 'Australia', 1.2),
+        ('Mountain', 'Japan', 0.8), ('Mountain', 'Italy', 0.6), ('Cold', 'Japan', 0.7)
+    ])
+    style_destination = _affinity(schema, 'travel_style', 'destination', [
+        ('Food', 'Italy', 1.2), ('Food', 'Japan', 1.0), ('Food', 'Thailand', 0.8), ('Historical', 'Greece', 1.2),
+        ('Historical', 'Italy', 1.0), ('City Break', 'France', 1.0), ('City Break', 'USA', 1.0),
+        ('Beach', 'Thailand', 0.8), ('Beach', 'Brazil', 0.8), ('Cultural', 'Japan', 0.8)
+    ])
+    destination_cost = np.array([0.3, 0.6, -1.0, 0.8, 0.4, 0.0, -0.2, -0.5, 0.7])
+    budget_z = (budget / duration - 200) / 100
+    logits = climate_destination[climate_preference] + style_destination[travel_style]
+    logits += np.outer(budget_z, destination_cost) * 0.7
+
+    return {
+        'budget': budget.astype(np.int32),
+        'travel_style': travel_style,
+        'climate_preference': climate_preference,
+        'duration': duration.astype(np.int16),
+        'travel_companions': travel_companions,
+        'season': season,
+        'destination': _sample_target(rng, logits)
+    }
+
+
+def professional_chunk(rng, n, schema):
+    """Generate n correlated professional profiles"""
+    experience_years = np.clip(rng.gamma(2.0, 4.5, n).round(), 0, 29)
+    education_level = _choice(rng, n, [0.12, 0.45, 0.28, 0.07, 0.08])
+    industry = _choice(rng, n, [0.22, 0.12, 0.1, 0.07, 0.12, 0.08, 0.08, 0.06, 0.08, 0.07])
+    job_type = _choice(rng, n, [0.55, 0.12, 0.15, 0.08, 0.1])
+    relocation_timeline = _choice(rng, n, [0.1, 0.25, 0.3, 0.2, 0.15])
+
+    # Salary grows with experience, education and industry
+    education_factor = np.array([0.7, 1.0, 1.15, 1.3, 0.8])[education_level]
+    industry_factor = np.array([1.3, 1.25, 1.15, 0.8, 1.1, 0.95, 0.9, 0.9, 1.2, 0.9])[industry]
+    salary_expectation = 45000 * education_factor * industry_factor * (1 + 0.045 * experience_years)
+    salary_expectation = np.clip(salary_expectation * rng.lognormal(0, 0.2, n), 30000, 199999).round()
+
+    industry_country = _affinity(schema, 'industry', 'country', [
+        ('Technology', 'USA', 1.5), ('Technology', 'Germany', 0.6), ('Technology', 'Netherlands', 0.7),
+        ('Technology', 'Singapore', 0.8), ('Finance', 'UK', 1.2), ('Finance', 'Switzerland', 1.5),
+        ('Finance', 'Singapore', 1.0), ('Finance', 'UAE', 0.8), ('Healthcare', 'Canada', 1.0),
+        ('Healthcare', 'Australia', 1.0), ('Engineering', 'Germany', 1.5), ('Manufacturing', 'Germany', 1.2),
+        ('Consulting', 'UK', 0.8), ('Consulting', 'UAE', 0.6), ('Education', 'Canada', 0.8), ('Education', 'UK', 0.6)
+    ])
+    country_pay = np.array([1.2, 0.2, 0.4, 0.3, 0.3, 1.0, 0.6, 0.1, 0.5])
+    salary_z = (salary_expectation - 80000) / 30000
+    logits = industry_country[industry] + np.outer(salary_z, country_pay) * 0.6
+
+    return {
+        'experience_years': experience_years.astype(np.int16),
+        'education_level': education_level,
+        'industry': industry,
+        'salary_expectation': salary_expectation.astype(np.int32),
+        'job_type': job_type,
+        'relocation_timeline': relocation_timeline,
+        'country': _sample_target(rng, logits)
+    }
+
+
+GENERATORS = {
+    'student': student_chunk,
+    'tourist': tourist_chunk,
+    'professional': professional_chunk
+}
@@ -1,122 +1,14 @@
 # modules/tourist_engine.py
-import pandas as pd
-import numpy as np
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.preprocessing import LabelEncoder
-import joblib
-import os
 import random
-from datetime import datetime, timedelta
+from modules.recommendation_engine import RecommendationEngine
 
-class TouristEngine:
-    def __init__(self):
-        self.model = None
-        self.label_encoders = {}
-        self.load_or_train_model()
-    
-    def load_or_train_model(self):
-        """Load existing model or train a new one"""
-        model_path = "models/tourist_model.pkl"
-        
-        if os.path.exists(model_path):
-            self.model, self.label_encoders = joblib.load(model_path)
-        else:
-            self.train_model()
-    
-    def train_model(self):
-        """Train the tourist recommendation model"""
-        # Load or generate sample data
-        from modules.data_loader import DataLoader
-        data_loader = DataLoader()
-        tourist_data = data_loader.load_tourist_data()
-        
-        # Preprocess data
-        X, y, label_encoders = self.preprocess_data(tourist_data)
-        
-        # Train model
-        from sklearn.model_selection import train_test_split
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-        
-        self.model = RandomForestClassifier(n_estimators=100, random_state=42)
-        self.model.fit(X_train, y_train)
-        
-        self.label_encoders = label_encoders
-        
-        # Save model
-        os.makedirs("models", exist_ok=True)
-        joblib.dump((self.model, self.label_encoders), "models/tourist_model.pkl")
-    
-    def preprocess_data(self, data):
-        """Preprocess tourist data for model training"""
-        label_encoders = {}
-        
-        # Encode categorical variables
-        categorical_columns = ['travel_style', 'climate_preference', 'travel_companions', 'season']
-        
-        for col in categorical_columns:
-            le = LabelEncoder()
-            data[col] = le.fit_transform(data[col])
-            label_encoders[col] = le
-        
-        # Encode target variable
-        le_destination = LabelEncoder()
-        data['destination'] = le_destination.fit_transform(data['destination'])
-        label_encoders['destination'] = le_destination
-        
-        # Prepare features and target
-        feature_columns = ['budget', 'duration'] + categorical_columns
-        X = data[feature_columns]
-        y = data['destination']
-        
-        return X, y, label_encoders
-    
-    def get_recommendations(self, user_input):
-        """Get destination recommendations based on user input"""
-        # Prepare input features
-        features = self.prepare_features(user_input)
-        
-        # Get predictions
-        probabilities = self.model.predict_proba([features])[0]
-        
-        # Get destination names
-        destination_encoder = self.label_encoders['destination']
-        destinations = destination_encoder.classes_
-        
-        # Create results
-        destination_probs = list(zip(destinations, probabilities))
-        destination_probs.sort(key=lambda x: x[1], reverse=True)
-        
-        top_destination, top_prob = destination_probs[0]
-        
-        return {
-            'top_recommendation': top_destination,
-            'top_probability': top_prob,
-            'destination_probabilities': destination_probs,
-            'confidence': top_prob
-        }
-    
-    def prepare_features(self, user_input):
-        """Prepare user input for model prediction"""
-        features = []
-        
-        # Numerical features
-        features.append(user_input['budget'])
-        features.append(user_input['duration'])
-        
-        # Categorical features
-        categorical_features = ['travel_style', 'climate_preference', 'travel_companions', 'season']
-        
-        for feature in categorical_features:
-            if feature in user_input:
-                le = self.label_encoders[feature]
-                # Handle unseen labels
-                if user_input[feature] in le.classes_:
-                    encoded = le.transform([user_input[feature]])[0]
-                else:
-                    encoded = 0  # Default value
-                features.append(encoded)
-        
-        return features
+class TouristEngine(RecommendationEngine):
+    model_name = 'tourist'
+    dataset = 'tourist'
+    numeric_features = ['budget', 'duration']
+    categorical_features = ['travel_style', 'climate_preference', 'travel_companions', 'season']
+    target = 'destination'
+    probabilities_key = 'destination_probabilities'
     
     def get_destination_details(self, destination):
         """Get detailed information about a destination"""
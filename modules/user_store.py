@@ -0,0 +1,331 @@
+# modules/user_store.py
+import copy
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import closing
+
+# SQLite storage for user accounts, preferences and search history.
+#
+# Uses the users and user_preferences tables of the shipped users.db. The
+# database runs in WAL mode so page loads can read while another session
+# writes, and every write touches only the affected user's rows. Accounts
+# from the legacy data/user_data/users.json are imported once.
+#
+# Search history is an append-only log: recording a search is a single
+# INSERT, whatever the number of users or past searches. Reads return the
+# newest SEARCH_HISTORY_LIMIT entries; older rows are pruned lazily, for the
+# inserting user, on one insert in every PRUNE_INTERVAL.
+#
+# Stores are shared per process through get_user_store, so schema setup runs
+# once rather than on every page load. Each store keeps a bounded in-process
+# index of user records, filled on first lookup through the unique username
+# index and invalidated whenever that user is written.
+
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users
+    (id INTEGER PRIMARY KEY AUTOINCREMENT,
+     username TEXT UNIQUE,
+     email TEXT UNIQUE,
+     password_hash TEXT,
+     user_type TEXT,
+     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
+CREATE TABLE IF NOT EXISTS user_preferences
+    (id INTEGER PRIMARY KEY AUTOINCREMENT,
+     user_id INTEGER,
+     preferences TEXT,
+     saved_searches TEXT,
+     FOREIGN KEY (user_id) REFERENCES users (id));
+CREATE UNIQUE INDEX IF NOT EXISTS idx_user_preferences_user_id ON user_preferences (user_id);
+CREATE TABLE IF NOT EXISTS search_history
+    (id INTEGER PRIMARY KEY AUTOINCREMENT,
+     user_id INTEGER NOT NULL,
+     created_at TEXT,
+     data TEXT,
+     FOREIGN KEY (user_id) REFERENCES users (id));
+CREATE INDEX IF NOT EXISTS idx_search_history_user_id ON search_history (user_id, id);
+CREATE TABLE IF NOT EXISTS write_journals
+    (journal TEXT PRIMARY KEY,
+     applied_seq INTEGER NOT NULL);
+"""
+
+SEARCH_HISTORY_LIMIT = 50
+PRUNE_INTERVAL = 25
+USER_CACHE_SIZE = 10000
+
+
+def _email_or_none(email):
+    """Email to store; blank emails become NULL so they never clash in the unique index"""
+    email = (email or '').strip()
+    return email or None
+
+
+class UserStore:
+    """User accounts backed by an indexed SQLite database"""
+
+    def __init__(self, db_path="users.db", legacy_json_path=None):
+        self.db_path = db_path
+        self.legacy_json_path = legacy_json_path
+        self._local = threading.local()
+        self._users = OrderedDict()
+        self._users_lock = threading.Lock()
+        self._initialize()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+
+    def _connection(self):
+        """This thread's connection, opened on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    def _initialize(self):
+        """Create the tables, switch to WAL and run the one-time JSON migration"""
+        os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.executescript(SCHEMA)
+
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version < SCHEMA_VERSION:
+                with conn:
+                    if version < 1:
+                        self._migrate_json(conn)
+                    if version < 2:
+                        self._migrate_saved_searches(conn)
+                    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _migrate_json(self, conn):
+        """Import the accounts of the legacy users.json file"""
+        if not self.legacy_json_path or not os.path.exists(self.legacy_json_path):
+            return
+
+        with open(self.legacy_json_path, 'r') as f:
+            users = json.load(f)
+
+        for username, record in users.items():
+            # users.json never made emails unique; the first account to use one keeps it
+            email = _email_or_none(record.get('email'))
+            owner = conn.execute("SELECT username FROM users WHERE email = ?", (email,)).fetchone()
+            if owner is not None and owner['username'] != username:
+                email = None
+
+            # users.json was the live store, so it wins over older rows
+            conn.execute(
+                """INSERT INTO users (username, email, password_hash, created_at) VALUES (?, ?, ?, ?)
+                   ON CONFLICT (username) DO UPDATE SET
+                       email = excluded.email, password_hash = excluded.password_hash,
+                       created_at = excluded.created_at""",
+                (username, email, record['password'], record.get('created_at'))
+            )
+            user_id = self._user_id(conn, username)
+            self._upsert_preferences(
+                conn, user_id,
+                preferences=record.get('preferences', {}),
+                saved_searches=record.get('search_history', [])[:SEARCH_HISTORY_LIMIT]
+            )
+
+    def _migrate_saved_searches(self, conn):
+        """Move the per-user saved_searches JSON lists into the search_history log"""
+        rows = conn.execute(
+            "SELECT user_id, saved_searches FROM user_preferences WHERE saved_searches NOT IN ('', '[]')"
+        ).fetchall()
+
+        for row in rows:
+            # Lists are newest first; insert oldest first so ids follow recency
+            for entry in reversed(json.loads(row['saved_searches'])):
+                conn.execute(
+                    "INSERT INTO search_history (user_id, created_at, data) VALUES (?, ?, ?)",
+                    (row['user_id'], entry.get('timestamp'), json.dumps(entry.get('data')))
+                )
+
+        conn.execute("UPDATE user_preferences SET saved_searches = '[]'")
+
+    @staticmethod
+    def _user_id(conn, username):
+        row = conn.execute("SELECT id FROM users WHERE username = ?", (username,)).fetchone()
+        return row['id'] if row else None
+
+    @staticmethod
+    def _upsert_preferences(conn, user_id, preferences=None, saved_searches=None):
+        conn.execute(
+            "INSERT INTO user_preferences (user_id, preferences, saved_searches) VALUES (?, '{}', '[]') "
+            "ON CONFLICT (user_id) DO NOTHING",
+            (user_id,)
+        )
+        if preferences is not None:
+            conn.execute("UPDATE user_preferences SET preferences = ? WHERE user_id = ?",
+                         (json.dumps(preferences), user_id))
+        if saved_searches is not None:
+            # Only used while migrating users.json; see _migrate_saved_searches
+            conn.execute("UPDATE user_preferences SET saved_searches = ? WHERE user_id = ?",
+                         (json.dumps(saved_searches), user_id))
+
+    def get_user(self, username):
+        """Return a user record shaped like the old users.json entries, or None"""
+        with self._users_lock:
+            record = self._users.get(username)
+            if record is not None:
+                self._users.move_to_end(username)
+
+        if record is None:
+            record = self._load_user(username)
+            if record is None:
+                return None
+            with self._users_lock:
+                self._users[username] = record
+                if len(self._users) > USER_CACHE_SIZE:
+                    self._users.popitem(last=False)
+
+        # Callers may modify the record (e.g. st.session_state['user_data'])
+        return copy.deepcopy(record)
+
+    def _invalidate(self, username):
+        with self._users_lock:
+            self._users.pop(username, None)
+
+    def _load_user(self, username):
+        conn = self._connection()
+        with conn:
+            row = conn.execute(
+                """SELECT u.id, u.password_hash, u.email, u.created_at, p.preferences
+                   FROM users u LEFT JOIN user_preferences p ON p.user_id = u.id
+                   WHERE u.username = ?""",
+                (username,)
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            history = conn.execute(
+                "SELECT created_at, data FROM search_history WHERE user_id = ? ORDER BY id DESC LIMIT ?",
+                (row['id'], SEARCH_HISTORY_LIMIT)
+            ).fetchall()
+
+        return {
+            'password': row['password_hash'],
+            'email': row['email'],
+            'created_at': row['created_at'],
+            'preferences': json.loads(row['preferences'] or '{}'),
+            'search_history': [
+                {'timestamp': entry['created_at'], 'data': json.loads(entry['data'])} for entry in history
+            ]
+        }
+
+    def create_user(self, username, password_hash, email, created_at):
+        """Insert a new user; returns (success, message)"""
+        conn = self._connection()
+        try:
+            with conn:
+                cursor = conn.execute(
+                    "INSERT INTO users (username, email, password_hash, created_at) VALUES (?, ?, ?, ?)",
+                    (username, _email_or_none(email), password_hash, created_at)
+                )
+                self._upsert_preferences(conn, cursor.lastrowid)
+        except sqlite3.IntegrityError:
+            if self._user_id(conn, username) is not None:
+                return False, "Username already exists"
+            return False, "Email already registered"
+
+        return True, "Registration successful"
+
+    def update_password(self, username, password_hash):
+        """Replace one user's stored password hash"""
+        conn = self._connection()
+        with conn:
+            conn.execute("UPDATE users SET password_hash = ? WHERE username = ?", (password_hash, username))
+        self._invalidate(username)
+
+    def update_preferences(self, username, preferences):
+        """Replace one user's preferences"""
+        conn = self._connection()
+        with conn:
+            user_id = self._user_id(conn, username)
+            if user_id is not None:
+                self._upsert_preferences(conn, user_id, preferences=preferences)
+        self._invalidate(username)
+
+    def add_search(self, username, search_entry):
+        """Append a search to one user's history log"""
+        conn = self._connection()
+        with conn:
+            cursor = conn.execute(
+                "INSERT INTO search_history (user_id, created_at, data) "
+                "SELECT id, ?, ? FROM users WHERE username = ?",
+                (search_entry['timestamp'], json.dumps(search_entry['data']), username)
+            )
+
+            if cursor.rowcount and cursor.lastrowid % PRUNE_INTERVAL == 0:
+                self._prune_search_history(conn, username)
+        self._invalidate(username)
+
+    def applied_seq(self, journal):
+        """Sequence number of the last write applied from a write journal (0 if none)"""
+        row = self._connection().execute(
+            "SELECT applied_seq FROM write_journals WHERE journal = ?", (journal,)
+        ).fetchone()
+        return row['applied_seq'] if row else 0
+
+    def apply_writes(self, preferences, searches, journal=None, applied_seq=None):
+        """Apply buffered writes in one transaction.
+
+        preferences maps usernames to their latest preferences; searches maps
+        usernames to lists of search entries, oldest first. If journal is
+        given, applied_seq is recorded for it in the same transaction.
+        """
+        conn = self._connection()
+        with conn:
+            if journal is not None:
+                conn.execute(
+                    "INSERT INTO write_journals (journal, applied_seq) VALUES (?, ?) "
+                    "ON CONFLICT (journal) DO UPDATE SET applied_seq = excluded.applied_seq",
+                    (journal, applied_seq)
+                )
+
+            for username, user_preferences in preferences.items():
+                user_id = self._user_id(conn, username)
+                if user_id is not None:
+                    self._upsert_preferences(conn, user_id, preferences=user_preferences)
+
+            for username, entries in searches.items():
+                conn.executemany(
+                    "INSERT INTO search_history (user_id, created_at, data) "
+                    "SELECT id, ?, ? FROM users WHERE username = ?",
+                    [(entry['timestamp'], json.dumps(entry['data']), username) for entry in entries]
+                )
+                self._prune_search_history(conn, username)
+
+        for username in set(preferences) | set(searches):
+            self._invalidate(username)
+
+    def _prune_search_history(self, conn, username):
+        """Delete one user's searches beyond the retention limit"""
+        conn.execute(
+            """DELETE FROM search_history WHERE id IN (
+                   SELECT id FROM search_history
+                   WHERE user_id = (SELECT id FROM users WHERE username = ?)
+                   ORDER BY id DESC LIMIT -1 OFFSET ?)""",
+            (username, SEARCH_HISTORY_LIMIT)
+        )
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_user_store(db_path="users.db", legacy_json_path=None):
+    """Return the process-wide UserStore for db_path, creating it on first use"""
+    key = os.path.abspath(db_path)
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = UserStore(db_path, legacy_json_path)
+        return _stores[key]
@@ -0,0 +1,210 @@
+# modules/write_buffer.py
+import atexit
+import json
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:
+    # No advisory locks (Windows): every process shares one journal
+    fcntl = None
+
+from modules.user_store import SEARCH_HISTORY_LIMIT, get_user_store
+
+# Buffered preference and search-history writes in front of a UserStore.
+#
+# Streamlit widgets can change preferences many times in quick succession, so
+# writes are not applied to SQLite one by one. Each write is first appended to
+# a journal file next to the database (one JSON line, fsynced) and then held
+# in memory, where repeated preference updates for a user collapse into the
+# latest one. Pending writes are applied in a single transaction when the
+# flush interval has passed, when MAX_PENDING writes are waiting, on logout
+# and at interpreter exit; the journal is then truncated. A journal left
+# behind by a crash is replayed when the buffer is next created, so every
+# acknowledged write reaches the database.
+#
+# Each journaled write carries a sequence number, and the highest one applied
+# is committed in the same transaction as the writes. Replay skips writes at
+# or below it, so a crash between that commit and the journal truncation does
+# not insert the same searches twice.
+#
+# Buffering is per process: every Streamlit session in a server process shares
+# its buffer. Several processes may serve the same database, so each buffer
+# journals to its own file. It claims the first of MAX_JOURNALS journal slots
+# it can take an exclusive flock on and holds the lock until it exits. A slot
+# therefore has one writer at a time, and its sequence numbers never collide.
+# On start a buffer also replays any other journal that is non-empty and not
+# locked, because those were left by processes that have died.
+
+FLUSH_INTERVAL = 5.0
+MAX_PENDING = 500
+JOURNAL_SUFFIX = ".writes.jsonl"
+MAX_JOURNALS = 64
+
+
+def _journal_slot(journal_path, slot):
+    """Path of a journal slot; slot 0 is journal_path itself"""
+    if slot == 0:
+        return journal_path
+    root, ext = os.path.splitext(journal_path)
+    return f"{root}.{slot}{ext}"
+
+
+def _open_locked(path):
+    """Open a journal for appending under an exclusive lock, or return None if another process holds it"""
+    journal = open(path, 'a')
+    if fcntl is not None:
+        try:
+            fcntl.flock(journal.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            journal.close()
+            return None
+    return journal
+
+
+class WriteBuffer:
+    """Journaled, coalescing write buffer for user preferences and search history"""
+
+    def __init__(self, store, journal_path=None, flush_interval=FLUSH_INTERVAL,
+                 max_pending=MAX_PENDING, fsync=True):
+        self.store = store
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.fsync = fsync
+
+        self._preferences = {}
+        self._searches = {}
+        self._pending = 0
+        self._timer = None
+        self._lock = threading.RLock()
+
+        base_path = journal_path or store.db_path + JOURNAL_SUFFIX
+        self._journal, self.journal_path = self._claim_journal(base_path)
+
+        # Journals are identified by file name, so they stay valid if moved with the database
+        self._journal_name = os.path.basename(self.journal_path)
+        self._seq = self._replay(self.journal_path, self._journal_name)
+        if fcntl is not None:
+            self._recover_orphans(base_path)
+        atexit.register(self.flush)
+
+    def _claim_journal(self, base_path):
+        """Open and lock the first journal slot no other process holds"""
+        for slot in range(MAX_JOURNALS):
+            path = _journal_slot(base_path, slot)
+            journal = _open_locked(path)
+            if journal is not None:
+                return journal, path
+        raise RuntimeError(f"All {MAX_JOURNALS} write journals for {base_path} are in use")
+
+    def _recover_orphans(self, base_path):
+        """Replay the journals of processes that exited without flushing"""
+        for slot in range(MAX_JOURNALS):
+            path = _journal_slot(base_path, slot)
+            if path == self.journal_path or not os.path.exists(path) or not os.path.getsize(path):
+                continue
+            journal = _open_locked(path)
+            if journal is not None:
+                with journal:
+                    self._replay(path, os.path.basename(path))
+
+    def _replay(self, path, journal_name):
+        """Apply the writes a crashed process left in a journal and return its last sequence number"""
+        applied = seq = self.store.applied_seq(journal_name)
+        with open(path, 'r') as f:
+            for line in f:
+                try:
+                    op = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final line was never acknowledged
+                    break
+                # Journals written before sequence numbers are replayed in full
+                if op.get('seq', applied + 1) > applied:
+                    seq = max(seq, op.get('seq', 0))
+                    self._buffer(op)
+
+        self._apply(journal_name, seq)
+        os.truncate(path, 0)
+        return seq
+
+    def _buffer(self, op):
+        if op['op'] == 'preferences':
+            self._preferences[op['username']] = op['preferences']
+        else:
+            self._searches.setdefault(op['username'], []).append(op['entry'])
+        self._pending += 1
+
+    def _write(self, op):
+        """Journal one write, then buffer it"""
+        with self._lock:
+            self._seq += 1
+            op['seq'] = self._seq
+            self._journal.write(json.dumps(op) + "\n")
+            self._journal.flush()
+            if self.fsync:
+                os.fsync(self._journal.fileno())
+
+            self._buffer(op)
+            if self._pending >= self.max_pending:
+                self.flush()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def update_preferences(self, username, preferences):
+        """Buffer a replacement of one user's preferences"""
+        self._write({'op': 'preferences', 'username': username, 'preferences': preferences})
+
+    def add_search(self, username, search_entry):
+        """Buffer a search for one user's history"""
+        self._write({'op': 'search', 'username': username, 'entry': search_entry})
+
+    def get_user(self, username):
+        """Return the stored user record with this buffer's pending writes applied"""
+        user = self.store.get_user(username)
+        if user is None:
+            return None
+
+        with self._lock:
+            if username in self._preferences:
+                user['preferences'] = json.loads(json.dumps(self._preferences[username]))
+            pending = self._searches.get(username)
+            if pending:
+                entries = json.loads(json.dumps(pending[::-1]))
+                user['search_history'] = (entries + user['search_history'])[:SEARCH_HISTORY_LIMIT]
+        return user
+
+    def _apply(self, journal_name, applied_seq):
+        if self._pending:
+            self.store.apply_writes(self._preferences, self._searches,
+                                    journal=journal_name, applied_seq=applied_seq)
+        self._preferences = {}
+        self._searches = {}
+        self._pending = 0
+
+    def flush(self):
+        """Apply all pending writes to the store and truncate the journal"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._pending:
+                return
+
+            self._apply(self._journal_name, self._seq)
+            self._journal.truncate(0)
+
+
+_buffers = {}
+_buffers_lock = threading.Lock()
+
+
+def get_write_buffer(db_path="users.db", legacy_json_path=None):
+    """Return the process-wide WriteBuffer for db_path, creating it on first use"""
+    key = os.path.abspath(db_path)
+    with _buffers_lock:
+        if key not in _buffers:
+            _buffers[key] = WriteBuffer(get_user_store(db_path, legacy_json_path))
+        return _buffers[key]
@@ -12,6 +12,7 @@ from modules.api_services import api_services
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from modules.professional_engine import ProfessionalEngine
+from modules.financial_tools import financial_tools
 from modules.visualization import Visualization
 from modules.auth import Authentication
 from modules.world_map import world_map  # ADD THIS LINE
@@ -128,6 +129,16 @@ def main():
             if salary_data:
                 fig = viz.create_salary_comparison_chart(salary_data)
                 st.plotly_chart(fig, use_container_width=True)
+            
+            # What the expected salary leaves after tax, insurance and living costs
+            st.subheader("🧮 Net Disposable Income by City")
+            net_income = financial_tools.net_disposable_income([salary_expectation])
+            st.dataframe(
+                net_income.sort_values('disposable_income', ascending=False)[
+                    ['city', 'country', 'income_tax', 'insurance', 'cost_of_living', 'disposable_monthly']
+                ].round(0),
+                use_container_width=True, hide_index=True
+            )
         
         else:
             st.info("👆 Configure your professional profile in the sidebar and click 'Find Opportunities' to get started!")
@@ -5,6 +5,7 @@ import os
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
+import numpy as np
 # Add these imports to each dashboard file
 import pandas as pd
 from datetime import datetime, timedelta
@@ -15,7 +16,7 @@ from modules.api_services import api_services
 # Add modules to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from modules.financial_tools import financial_tools
+from modules.financial_tools import BASE_CURRENCY, financial_tools
 from modules.api_services import api_services
 from modules.auth import Authentication
 
@@ -29,6 +30,23 @@ st.set_page_config(
 # Initialize components
 auth = Authentication()
 
+DISPLAY_CURRENCIES = ['USD', 'EUR', 'GBP', 'CAD', 'AUD', 'JPY', 'CHF', 'CNY', 'INR']
+
+def in_display_currency(result):
+    """A FinancialTools result converted to the selected display currency"""
+    currency = st.session_state.get('display_currency', BASE_CURRENCY)
+    return financial_tools.convert_results(result, currency, rates=st.session_state.get('currency_rates'))
+
+def display_unit():
+    """Unit for axis and column titles: $ for USD, otherwise the currency code"""
+    currency = st.session_state.get('display_currency', BASE_CURRENCY)
+    return "$" if currency == BASE_CURRENCY else currency
+
+def format_money(amount, decimals=0):
+    """Amount formatted in the selected display currency"""
+    unit = display_unit()
+    return f"${amount:,.{decimals}f}" if unit == "$" else f"{amount:,.{decimals}f} {unit}"
+
 def main():
     # Check authentication
     if not auth.is_authenticated():
@@ -48,10 +66,17 @@ def main():
             "📈 Investment Planning",
             "🏖️ Retirement Planning",
             "🛡️ Insurance Analysis",
+            "🌍 Net Income Comparison",
+            "🏠 Loan Planner",
             "🎯 Savings Goals"
         ]
     )
     
+    # Rates are looked up once per run and shared by every conversion on the page
+    st.session_state.display_currency = st.sidebar.selectbox("Display Currency", DISPLAY_CURRENCIES)
+    if st.session_state.display_currency != BASE_CURRENCY:
+        st.session_state.currency_rates = financial_tools.currency_rate_matrix()
+    
     #if tool_selection == "💱 Currency & Cost of Living":
       #  show_currency_col_tools()
     if tool_selection == "🧾 Tax Calculator":
@@ -62,6 +87,10 @@ def main():
         show_retirement_planning()
     elif tool_selection == "🛡️ Insurance Analysis":
         show_insurance_analysis()
+    elif tool_selection == "🌍 Net Income Comparison":
+        show_net_income_comparison()
+    elif tool_selection == "🏠 Loan Planner":
+        show_loan_planner()
     elif tool_selection == "🎯 Savings Goals":
         show_savings_goals()
 
@@ -173,9 +202,10 @@ def show_tax_calculator():
         
         if st.button("Calculate Taxes", type="primary"):
             if selected_countries:
-                results = {}
-                for country in selected_countries:
-                    results[country] = financial_tools.calculate_income_tax(country, annual_income)
+                results = in_display_currency({
+                    country: financial_tools.calculate_income_tax(country, annual_income)
+                    for country in selected_countries
+                })
                 
                 # Display results
                 st.subheader("Tax Comparison Results")
@@ -185,11 +215,11 @@ def show_tax_calculator():
                 for country, tax_data in results.items():
                     comparison_data.append({
                         'Country': country,
-                        'Gross Income': f"${tax_data['gross_income']:,.0f}",
-                        'Total Tax': f"${tax_data['total_tax']:,.0f}",
-                        'Net Income': f"${tax_data['net_income']:,.0f}",
+                        'Gross Income': format_money(tax_data['gross_income']),
+                        'Total Tax': format_money(tax_data['total_tax']),
+                        'Net Income': format_money(tax_data['net_income']),
                         'Effective Tax Rate': f"{tax_data['effective_tax_rate']:.1%}",
-                        'Monthly Net': f"${tax_data['monthly_net']:,.0f}"
+                        'Monthly Net': format_money(tax_data['monthly_net'])
                     })
                 
                 comparison_df = pd.DataFrame(comparison_data)
@@ -210,10 +240,31 @@ def show_tax_calculator():
                 
                 fig2 = go.Figure()
                 fig2.add_trace(go.Bar(name='Net Income', x=countries, y=net_incomes,
-                                     text=[f'${income:,.0f}' for income in net_incomes], textposition='auto'))
+                                     text=[format_money(income) for income in net_incomes], textposition='auto'))
                 fig2.update_layout(title='Net Income After Tax by Country')
                 st.plotly_chart(fig2, use_container_width=True)
-    
+
+        if selected_countries:
+            st.subheader("Tax Curves by Income")
+
+            # Whole income range in one vectorized call
+            curves = financial_tools.calculate_income_tax_batch(np.linspace(0, 500000, 2001), selected_countries)
+            curves, marker = in_display_currency([curves, float(annual_income)])
+            unit = display_unit()
+
+            fig3 = px.line(curves, x='gross_income', y='effective_tax_rate', color='country',
+                           title='Effective Tax Rate by Income',
+                           labels={'gross_income': f'Annual Income ({unit})', 'effective_tax_rate': 'Effective Tax Rate'})
+            fig3.add_vline(x=marker, line_dash='dash')
+            fig3.update_layout(yaxis_tickformat='.0%')
+            st.plotly_chart(fig3, use_container_width=True)
+
+            fig4 = px.line(curves, x='gross_income', y='net_income', color='country',
+                           title='Net Income by Gross Income',
+                           labels={'gross_income': f'Annual Income ({unit})', 'net_income': f'Net Income ({unit})'})
+            fig4.add_vline(x=marker, line_dash='dash')
+            st.plotly_chart(fig4, use_container_width=True)
+
     with col2:
         st.subheader("💡 Tax Tips")
         st.info("""
@@ -247,48 +298,47 @@ def show_investment_planning():
         
         if st.button("Calculate Investment Growth", type="primary"):
             # Single strategy calculation
-            result = financial_tools.calculate_investment_growth(
-                initial_investment, monthly_contribution, investment_years, expected_return
-            )
+            result = in_display_currency(financial_tools.calculate_investment_growth(
+                initial_investment, monthly_contribution, investment_years, expected_return,
+                include_breakdown=False
+            ))
             
-            st.success(f"**Projected Value: ${result['total_value']:,.2f}**")
+            st.success(f"**Projected Value: {format_money(result['total_value'], 2)}**")
             
             # Display key metrics
             metric_col1, metric_col2, metric_col3 = st.columns(3)
             with metric_col1:
-                st.metric("Total Contributions", f"${result['total_contributions']:,.0f}")
+                st.metric("Total Contributions", format_money(result['total_contributions']))
             with metric_col2:
-                st.metric("Total Earnings", f"${result['total_earnings']:,.0f}")
+                st.metric("Total Earnings", format_money(result['total_earnings']))
             with metric_col3:
                 st.metric("Return on Investment", f"{(result['total_earnings']/result['total_contributions'])*100:.1f}%")
             
             # Yearly breakdown chart
-            yearly_data = result['yearly_breakdown']
-            years = [data['year'] for data in yearly_data]
-            values = [data['value'] for data in yearly_data]
-            contributions = [data['contributions'] for data in yearly_data]
+            schedule = result['schedule']
             
             fig = go.Figure()
-            fig.add_trace(go.Scatter(name='Portfolio Value', x=years, y=values, fill='tozeroy'))
-            fig.add_trace(go.Scatter(name='Total Contributions', x=years, y=contributions, line=dict(dash='dash')))
-            fig.update_layout(title='Investment Growth Over Time', xaxis_title='Years', yaxis_title='Value ($)')
+            fig.add_trace(go.Scatter(name='Portfolio Value', x=schedule['year'], y=schedule['value'], fill='tozeroy'))
+            fig.add_trace(go.Scatter(name='Total Contributions', x=schedule['year'], y=schedule['contributions'],
+                                     line=dict(dash='dash')))
+            fig.update_layout(title='Investment Growth Over Time', xaxis_title='Years', yaxis_title=f'Value ({display_unit()})')
             st.plotly_chart(fig, use_container_width=True)
     
     with col2:
         st.subheader("Strategy Comparison")
         
         if st.button("Compare Strategies", type="secondary"):
-            strategies = financial_tools.compare_investment_strategies(
-                initial_investment, monthly_contribution, investment_years
-            )
+            strategies = in_display_currency(financial_tools.compare_investment_strategies(
+                initial_investment, monthly_contribution, investment_years, include_breakdown=False
+            ))
             
             strategy_data = []
             for strategy_name, strategy_result in strategies.items():
                 strategy_data.append({
                     'Strategy': strategy_name,
-                    'Final Value': f"${strategy_result['total_value']:,.0f}",
-                    'Total Contributions': f"${strategy_result['total_contributions']:,.0f}",
-                    'Total Earnings': f"${strategy_result['total_earnings']:,.0f}"
+                    'Final Value': format_money(strategy_result['total_value']),
+                    'Total Contributions': format_money(strategy_result['total_contributions']),
+                    'Total Earnings': format_money(strategy_result['total_earnings'])
                 })
             
             strategy_df = pd.DataFrame(strategy_data)
@@ -300,7 +350,16 @@ def show_investment_planning():
             
             fig = px.bar(x=strategy_names, y=final_values, 
                         title='Final Portfolio Value by Strategy',
-                        labels={'x': 'Investment Strategy', 'y': 'Final Value ($)'})
+                        labels={'x': 'Investment Strategy', 'y': f'Final Value ({display_unit()})'})
+            st.plotly_chart(fig, use_container_width=True)
+            
+            # Growth paths of every strategy from their schedules
+            growth_df = pd.concat(
+                [strategy_result['schedule'].assign(strategy=name) for name, strategy_result in strategies.items()]
+            )
+            fig = px.line(growth_df, x='year', y='value', color='strategy',
+                          title='Portfolio Value by Strategy Over Time',
+                          labels={'year': 'Years', 'value': f'Value ({display_unit()})', 'strategy': 'Strategy'})
             st.plotly_chart(fig, use_container_width=True)
         
         st.subheader("💡 Investment Tips")
@@ -312,6 +371,51 @@ def show_investment_planning():
         - Rebalance portfolio annually
         - Stay invested during market fluctuations
         """)
+    
+    st.subheader("🎲 Monte Carlo Projection")
+    
+    mc_col1, mc_col2, mc_col3 = st.columns(3)
+    with mc_col1:
+        target_value = st.number_input("Target Value ($)", min_value=0, value=500000, step=10000)
+    with mc_col2:
+        volatility = st.slider("Annual Volatility (%)", 0.0, 30.0, 15.0, 1.0) / 100
+    with mc_col3:
+        n_paths = st.select_slider("Simulated Paths", [1000, 5000, 10000, 20000, 50000], value=20000)
+    
+    if st.button("Run Simulation", type="secondary"):
+        simulation = in_display_currency(financial_tools.simulate_investment_growth(
+            initial_investment, monthly_contribution, investment_years, expected_return,
+            goal=target_value, volatility=volatility, n_paths=n_paths
+        ))
+        
+        metric_col1, metric_col2, metric_col3 = st.columns(3)
+        with metric_col1:
+            st.metric("Probability of Reaching Target", f"{simulation['probability_of_goal']:.0%}")
+        with metric_col2:
+            st.metric("Median Final Value", format_money(simulation['median_final_value']))
+        with metric_col3:
+            st.metric("Paths Simulated", f"{simulation['paths']:,}")
+        
+        if simulation['truncated']:
+            st.caption(f"Stopped at the time budget after {simulation['paths']:,} paths")
+        
+        st.plotly_chart(percentile_band_chart(simulation['percentiles'], 'Projected Portfolio Value', simulation['goal']),
+                        use_container_width=True)
+        st.plotly_chart(percentile_band_chart(simulation['real_percentiles'], "Projected Value at Today's Prices"),
+                        use_container_width=True)
+
+def percentile_band_chart(bands, title, target=None):
+    """Fan chart of simulated percentile bands by year"""
+    fig = go.Figure()
+    for low, high, opacity in [('p5', 'p95', 0.15), ('p25', 'p75', 0.3)]:
+        fig.add_trace(go.Scatter(x=bands.index, y=bands[high], line=dict(width=0), showlegend=False))
+        fig.add_trace(go.Scatter(name=f'{low[1:]}th-{high[1:]}th percentile', x=bands.index, y=bands[low],
+                                 fill='tonexty', line=dict(width=0), fillcolor=f'rgba(31, 119, 180, {opacity})'))
+    fig.add_trace(go.Scatter(name='Median', x=bands.index, y=bands['p50'], line=dict(color='rgb(31, 119, 180)')))
+    if target is not None:
+        fig.add_hline(y=target, line_dash='dash', annotation_text='Target')
+    fig.update_layout(title=title, xaxis_title='Years', yaxis_title=f'Value ({display_unit()})')
+    return fig
 
 # ... (Similar implementations for other financial tools would follow)
 
@@ -334,18 +438,19 @@ def show_retirement_planning():
                 current_age, retirement_age, current_savings, desired_income
             )
             
-            st.success(f"**Total Retirement Fund Needed: ${plan['total_retirement_needed']:,.2f}**")
+            shown = in_display_currency(plan)
+            st.success(f"**Total Retirement Fund Needed: {format_money(shown['total_retirement_needed'], 2)}**")
             
             # Display retirement metrics
             metric_col1, metric_col2, metric_col3 = st.columns(3)
             with metric_col1:
                 st.metric("Working Years Remaining", plan['working_years'])
-                st.metric("Monthly Savings Needed", f"${plan['monthly_savings_needed']:,.0f}")
+                st.metric("Monthly Savings Needed", format_money(shown['monthly_savings_needed']))
             with metric_col2:
                 st.metric("Retirement Years", plan['retirement_years'])
-                st.metric("Future Current Savings", f"${plan['future_current_savings']:,.0f}")
+                st.metric("Future Current Savings", format_money(shown['future_current_savings']))
             with metric_col3:
-                st.metric("Inflation Adjusted Income", f"${plan['inflation_adjusted_income']:,.0f}")
+                st.metric("Inflation Adjusted Income", format_money(shown['inflation_adjusted_income']))
             
             # Retirement readiness
             readiness_score = financial_tools.retirement_readiness_score(
@@ -360,6 +465,19 @@ def show_retirement_planning():
                 st.warning("📊 Good progress, but consider increasing savings.")
             else:
                 st.error("⚠️ Needs attention. Consider adjusting your retirement plan.")
+            
+            # Same plan under random returns and inflation
+            simulation = in_display_currency(financial_tools.simulate_retirement(
+                current_age, retirement_age, current_savings, desired_income
+            ))
+            
+            st.subheader("🎲 Monte Carlo Check")
+            st.metric("Probability of Funding Retirement", f"{simulation['probability_of_goal']:.0%}",
+                      help=f"Saving {format_money(simulation['monthly_savings'])}/month across "
+                           f"{simulation['paths']:,} simulated return and inflation paths")
+            st.plotly_chart(percentile_band_chart(simulation['percentiles'], 'Projected Retirement Savings',
+                                                  simulation['median_target']),
+                            use_container_width=True)
     
     with col2:
         st.subheader("Retirement Tips")
@@ -371,6 +489,30 @@ def show_retirement_planning():
         - Consider part-time work in early retirement
         - Review and adjust plan annually
         """)
+        
+        st.subheader("🗺️ Plan Explorer")
+        
+        # Every retirement age, return rate and income level in one call
+        income_levels = [int(desired_income * factor) for factor in (0.5, 0.75, 1.0, 1.25, 1.5)]
+        sweep = in_display_currency(financial_tools.sweep_retirement_needs(
+            current_age, current_savings,
+            retirement_ages=np.arange(current_age + 1, 76),
+            expected_returns=np.arange(0.03, 0.1001, 0.005),
+            desired_incomes=income_levels
+        ))
+        
+        explored_income = st.select_slider("Desired Income (per year)", income_levels, value=income_levels[2],
+                                           format_func=lambda income: format_money(in_display_currency(float(income))))
+        heatmap = pd.DataFrame(
+            sweep['monthly_savings_needed'][income_levels.index(explored_income)],
+            index=sweep['retirement_ages'].astype(int),
+            columns=[f"{rate:.1%}" for rate in sweep['expected_returns']]
+        )
+        
+        fig = px.imshow(heatmap, aspect='auto', color_continuous_scale='RdYlGn_r',
+                        title='Monthly Savings Needed by Retirement Age and Return',
+                        labels={'x': 'Expected Annual Return', 'y': 'Retirement Age', 'color': f'Monthly ({display_unit()})'})
+        st.plotly_chart(fig, use_container_width=True)
 
 def show_insurance_analysis():
     """Insurance cost analysis"""
@@ -386,16 +528,16 @@ def show_insurance_analysis():
         coverage_level = st.selectbox("Coverage Level", ['basic', 'standard', 'premium'])
         
         if st.button("Calculate Insurance Costs", type="primary"):
-            insurance_costs = financial_tools.calculate_insurance_costs(country, age, coverage_level)
+            insurance_costs = in_display_currency(financial_tools.calculate_insurance_costs(country, age, coverage_level))
             
             st.subheader(f"Monthly Insurance Costs for {country}")
             
             # Display insurance costs
             for insurance_type, cost in insurance_costs['monthly_costs'].items():
-                st.metric(insurance_type.title(), f"${cost}")
+                st.metric(insurance_type.title(), format_money(cost, 2))
             
-            st.metric("Total Monthly", f"${insurance_costs['total_monthly']}")
-            st.metric("Total Annual", f"${insurance_costs['total_annual']}")
+            st.metric("Total Monthly", format_money(insurance_costs['total_monthly'], 2))
+            st.metric("Total Annual", format_money(insurance_costs['total_annual'], 2))
             
             # Insurance cost breakdown chart
             insurance_types = list(insurance_costs['monthly_costs'].keys())
@@ -417,7 +559,7 @@ def show_insurance_analysis():
         if st.button("Compare Insurance Costs", type="secondary"):
             comparison_data = []
             for country in compare_countries:
-                costs = financial_tools.calculate_insurance_costs(country, age, coverage_level)
+                costs = in_display_currency(financial_tools.calculate_insurance_costs(country, age, coverage_level))
                 comparison_data.append({
                     'Country': country,
                     'Health Insurance': costs['monthly_costs']['health'],
@@ -427,8 +569,111 @@ def show_insurance_analysis():
                     'Total Monthly': costs['total_monthly']
                 })
             
-            comparison_df = pd.DataFrame(comparison_data)
+            comparison_df = pd.DataFrame(comparison_data).round(2)
             st.dataframe(comparison_df, use_container_width=True)
+            st.caption(f"Monthly costs in {st.session_state.get('display_currency', BASE_CURRENCY)}")
+
+def show_net_income_comparison():
+    """Disposable income after tax, insurance and cost of living across cities"""
+    st.header("🌍 Net Income Comparison")
+    
+    col1, col2 = st.columns([1, 2])
+    
+    with col1:
+        st.subheader("Your Situation")
+        
+        salary = st.slider("Annual Salary ($)", 20000, 300000, 80000, 5000)
+        age = st.slider("Age", 18, 80, 35, key="net_income_age")
+        coverage_level = st.selectbox("Insurance Coverage", ['basic', 'standard', 'premium'], index=1)
+        cities = st.multiselect("Cities", financial_tools.cities, default=financial_tools.cities)
+    
+    with col2:
+        if cities:
+            # Every city at every salary level in one call
+            salary_levels = np.arange(20000, 300001, 5000)
+            matrix = financial_tools.net_disposable_income(
+                np.union1d(salary_levels, [salary]), cities, age=age, coverage_level=coverage_level
+            )
+            current = matrix[matrix['salary'] == salary].sort_values('disposable_income', ascending=False)
+            
+            # Whole table converted at once; salary inputs stay in USD
+            matrix, current = in_display_currency([matrix, current])
+            unit = display_unit()
+            
+            st.subheader(f"At {format_money(current['salary'].iloc[0])} per year")
+            st.dataframe(
+                current[['city', 'country', 'income_tax', 'insurance', 'cost_of_living',
+                         'disposable_income', 'disposable_monthly']].round(0),
+                use_container_width=True, hide_index=True
+            )
+            
+            fig = px.bar(current, x='city', y=['income_tax', 'insurance', 'cost_of_living', 'disposable_income'],
+                         title='Where Your Salary Goes',
+                         labels={'value': f'Annual Amount ({unit})', 'city': 'City', 'variable': 'Component'})
+            st.plotly_chart(fig, use_container_width=True)
+            
+            fig = px.line(matrix, x='salary', y='disposable_monthly', color='city',
+                          title='Monthly Disposable Income by Salary',
+                          labels={'salary': f'Annual Salary ({unit})',
+                                  'disposable_monthly': f'Monthly Disposable ({unit})'})
+            fig.add_vline(x=current['salary'].iloc[0], line_dash='dash')
+            st.plotly_chart(fig, use_container_width=True)
+
+def show_loan_planner():
+    """Loan amortization and extra payment scenarios"""
+    st.header("🏠 Loan Planner")
+    
+    col1, col2 = st.columns([1, 2])
+    
+    with col1:
+        st.subheader("Loan Details")
+        
+        principal = st.number_input("Loan Amount ($)", min_value=1000, value=300000, step=5000)
+        annual_rate = st.slider("Interest Rate (%/year)", 0.0, 15.0, 6.5, 0.125) / 100
+        term_years = st.selectbox("Term (Years)", [10, 15, 20, 25, 30], index=4)
+        extra_payment = st.number_input("Extra Monthly Payment ($)", min_value=0, value=200, step=50)
+    
+    with col2:
+        term_months = term_years * 12
+        table = in_display_currency(financial_tools.amortization_table(principal, annual_rate, term_months, extra_payment))
+        
+        st.subheader("Your Schedule")
+        metric_col1, metric_col2, metric_col3 = st.columns(3)
+        with metric_col1:
+            st.metric("Monthly Payment", format_money(table['payment'].iloc[0]))
+        with metric_col2:
+            st.metric("Payoff", f"{len(table) / 12:.1f} years")
+        with metric_col3:
+            st.metric("Total Interest", format_money(table['interest'].sum()))
+        
+        # Yearly totals keep the chart readable for long loans
+        yearly = table.groupby((table['month'] - 1) // 12 + 1).agg(
+            interest=('interest', 'sum'), principal=('principal', 'sum'), balance=('balance', 'last')
+        )
+        fig = px.bar(yearly, x=yearly.index, y=['principal', 'interest'],
+                     title='Principal and Interest Paid per Year',
+                     labels={'month': 'Year', 'value': f'Amount ({display_unit()})', 'variable': 'Component'})
+        st.plotly_chart(fig, use_container_width=True)
+        
+        # Every extra payment scenario in one vectorized call
+        extras = np.union1d([0, 100, 250, 500, 1000], [extra_payment])
+        scenarios = in_display_currency(financial_tools.compare_extra_payments(principal, annual_rate, term_months, extras))
+        
+        st.subheader("Extra Payment Scenarios")
+        st.dataframe(scenarios[['extra_payment', 'monthly_payment', 'payoff_month', 'months_saved',
+                                'total_interest', 'interest_saved']].round(0),
+                     use_container_width=True, hide_index=True)
+        
+        schedules = in_display_currency(financial_tools.amortization_schedule(
+            np.full(len(extras), principal), annual_rate, term_months, extras
+        ))
+        balances = pd.DataFrame(schedules['balance'].T,
+                                columns=[f"+{format_money(extra)}" for extra in scenarios['extra_payment']])
+        balances.index = balances.index + 1
+        fig = px.line(balances, x=balances.index, y=list(balances.columns),
+                      title='Remaining Balance by Extra Payment',
+                      labels={'index': 'Month', 'value': f'Balance ({display_unit()})', 'variable': 'Extra Payment'})
+        st.plotly_chart(fig, use_container_width=True)
 
 def show_savings_goals():
     """Savings goal tracking"""
@@ -446,16 +691,16 @@ def show_savings_goals():
         monthly_contribution = st.number_input("Monthly Contribution ($)", min_value=0, value=500, step=50)
         
         if st.button("Analyze Goal", type="primary"):
-            goal_analysis = financial_tools.calculate_savings_goal(
+            goal_analysis = in_display_currency(financial_tools.calculate_savings_goal(
                 goal_amount, current_savings, timeframe, monthly_contribution
-            )
+            ))
             
             if goal_analysis['goal_achievable']:
                 st.success(f"✅ You will achieve your {goal_name} goal!")
-                st.metric("Projected Savings", f"${goal_analysis['projected_savings']:,.0f}")
+                st.metric("Projected Savings", format_money(goal_analysis['projected_savings']))
             else:
-                st.warning(f"⚠️ You'll be ${goal_analysis['shortfall']:,.0f} short of your goal")
-                st.metric("Additional Monthly Needed", f"${goal_analysis['monthly_needed']:,.0f}")
+                st.warning(f"⚠️ You'll be {format_money(goal_analysis['shortfall'])} short of your goal")
+                st.metric("Additional Monthly Needed", format_money(goal_analysis['monthly_needed']))
     
     with col2:
         st.subheader("Multiple Goals Planner")
@@ -475,17 +720,27 @@ def show_savings_goals():
         }
         
         available_monthly = st.number_input("Available Monthly Savings ($)", min_value=100, value=1500, step=100)
+        savings_return = st.slider("Savings Return (%/year)", 0.0, 8.0, 3.0, 0.5) / 100
         
         if st.button("Create Savings Plan", type="secondary"):
-            plan = financial_tools.create_savings_plan(example_goals)
+            plan = in_display_currency(financial_tools.optimize_savings_plan(example_goals, available_monthly, savings_return))
             
             st.subheader("Savings Plan Summary")
             for goal, details in plan['goal_plans'].items():
-                st.write(f"**{goal}**: ${details['monthly_needed']:,.0f}/month")
+                status = "✅" if details['achievable'] else f"⚠️ {format_money(details['shortfall'])} short"
+                st.write(f"**{goal}** ({details['priority']}): {format_money(details['average_monthly'])}/month "
+                         f"for {details['timeframe']} months {status}")
             
-            st.metric("Total Monthly Needed", f"${plan['total_monthly_needed']:,.0f}")
+            st.metric("Total Monthly Needed", format_money(plan['total_monthly_needed']))
             st.metric("Feasibility", plan['feasibility'])
             
+            # Month-by-month allocation of the budget
+            schedule = plan['schedule'].assign(Unallocated=plan['unallocated'])
+            fig = px.area(schedule, x=schedule.index, y=list(schedule.columns),
+                          title='Monthly Contributions by Goal',
+                          labels={'x': 'Month', 'month': 'Month', 'value': f'Contribution ({display_unit()})', 'variable': 'Goal'})
+            st.plotly_chart(fig, use_container_width=True)
+            
     
 
 if __name__ == "__main__":
@@ -21,5 +21,50 @@ class APIConfig:
     
     # Fallback settings
     USE_SIMULATED_DATA = True  # Set to False if you get real API keys later
+
+
+class ModelConfig:
+    """Model size profiles for the recommendation engines"""
+    
+    # Random forest settings, from smallest/fastest to largest/most accurate
+    PROFILES = {
+        'fast': {'n_estimators': 30, 'max_depth': 10, 'min_samples_leaf': 5},
+        'balanced': {'n_estimators': 100, 'max_depth': 20, 'min_samples_leaf': 2},
+        'accurate': {'n_estimators': 200, 'max_depth': None, 'min_samples_leaf': 1}
+    }
+    
+    # Profile used when an engine is created without one
+    DEFAULT_PROFILE = os.getenv('MODEL_PROFILE', 'balanced')
+
+
+class AuthConfig:
+    """Password hashing settings"""
+    
+    # Hasher and work factor per profile; stored hashes made with other
+    # settings are re-hashed on the user's next successful login
+    PROFILES = {
+        'fast': {'algorithm': 'pbkdf2_sha256', 'iterations': 100_000},
+        'balanced': {'algorithm': 'pbkdf2_sha256', 'iterations': 600_000},
+        'scrypt': {'algorithm': 'scrypt', 'n': 2 ** 14, 'r': 8, 'p': 1}
+    }
+    
+    # Profile used for new and re-hashed passwords
+    DEFAULT_PROFILE = os.getenv('PASSWORD_HASH_PROFILE', 'balanced')
+
+
+class SimulationConfig:
+    """Monte Carlo settings for the financial projections"""
+    
+    # Paths per simulation, simulated CHUNK_SIZE paths at a time to bound memory
+    PATHS = int(os.getenv('MONTE_CARLO_PATHS', 20000))
+    CHUNK_SIZE = 5000
+    
+    # Seconds a simulation may run before it stops with the paths done so far
+    TIME_BUDGET = float(os.getenv('MONTE_CARLO_TIME_BUDGET', 1.0))
+    
+    # Return and inflation uncertainty (annual standard deviations)
+    RETURN_VOLATILITY = 0.15
+    INFLATION = 0.03
+    INFLATION_VOLATILITY = 0.01
     
-    
\ No newline at end of file
+    PERCENTILES = (5, 25, 50, 75, 95)